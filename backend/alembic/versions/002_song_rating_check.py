@@ -0,0 +1,35 @@
+"""Constrain song ratings to the 0-5 range
+
+Requires a songs table that matches app.models.song as it was before this
+revision, i.e. one created by ``make db-init`` (create_all). Migration 001
+still describes the older song_id/created_by schema, which lacks the rating
+column, so ``alembic upgrade head`` from an empty database fails at this step.
+For a new database run ``make db-init`` and then ``alembic stamp head``.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "002"
+down_revision = "001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add CHECK constraint on songs.rating."""
+    op.create_check_constraint(
+        "ck_songs_rating_range",
+        "songs",
+        "rating >= 0 AND rating <= 5",
+    )
+
+
+def downgrade() -> None:
+    """Drop CHECK constraint on songs.rating."""
+    op.drop_constraint("ck_songs_rating_range", "songs", type_="check")
@@ -0,0 +1,55 @@
+"""Add full-text and trigram search indexes on songs
+
+Requires a songs table that matches app.models.song as it was before this
+revision, i.e. one created by ``make db-init`` (create_all). Migration 001
+still describes the older song_id/created_by schema, which lacks the album
+column, so ``alembic upgrade head`` from an empty database fails at this step.
+For a new database run ``make db-init`` and then ``alembic stamp head``.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create GIN indexes backing song search."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Expressions must match SONG_SEARCH_DOCUMENT / SONG_LYRICS_DOCUMENT in app.models.song
+    op.execute(
+        "CREATE INDEX ix_songs_search ON songs USING gin "
+        "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(artist, '') "
+        "|| ' ' || coalesce(album, '')))"
+    )
+    op.execute(
+        "CREATE INDEX ix_songs_lyrics_search ON songs USING gin "
+        "(to_tsvector('english', coalesce(lyrics, '')))"
+    )
+
+    # Trigram indexes serve the single-column ILIKE '%term%' filters
+    for column in ("artist", "album", "genre"):
+        op.create_index(
+            f"ix_songs_{column}_trgm",
+            "songs",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Drop song search indexes."""
+    for column in ("artist", "album", "genre"):
+        op.drop_index(f"ix_songs_{column}_trgm", table_name="songs")
+    op.drop_index("ix_songs_lyrics_search", table_name="songs")
+    op.drop_index("ix_songs_search", table_name="songs")
@@ -0,0 +1,55 @@
+"""Add partial indexes for public song listings
+
+Requires a songs table that matches app.models.song as it was before this
+revision, i.e. one created by ``make db-init`` (create_all). Migration 001
+still describes the older song_id/created_by schema, which lacks the views,
+rating and user_id columns, so ``alembic upgrade head`` from an empty database
+fails at this step. For a new database run ``make db-init`` and then ``alembic
+stamp head``.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create partial indexes for public listings and an index on songs.user_id."""
+    # Predicates must line up with the SongService filters for the planner to use them
+    op.create_index(
+        "ix_songs_public_views",
+        "songs",
+        [sa.text("views DESC")],
+        postgresql_where=sa.text("is_public = true"),
+    )
+    op.create_index(
+        "ix_songs_public_rating",
+        "songs",
+        [sa.text("rating DESC")],
+        postgresql_where=sa.text("is_public = true AND rating > 0"),
+    )
+    op.create_index(
+        "ix_songs_public_created",
+        "songs",
+        [sa.text("created_at DESC")],
+        postgresql_where=sa.text("is_public = true"),
+    )
+    op.create_index("ix_songs_user", "songs", ["user_id"])
+
+
+def downgrade() -> None:
+    """Drop public listing indexes."""
+    op.drop_index("ix_songs_user", table_name="songs")
+    op.drop_index("ix_songs_public_created", table_name="songs")
+    op.drop_index("ix_songs_public_rating", table_name="songs")
+    op.drop_index("ix_songs_public_views", table_name="songs")
@@ -0,0 +1,51 @@
+"""Add songs_filter_options materialized view
+
+Requires a songs table that matches app.models.song as it was before this
+revision, i.e. one created by ``make db-init`` (create_all). Migration 001
+still describes the older song_id/created_by schema, which lacks the album,
+year and difficulty columns, so ``alembic upgrade head`` from an empty database
+fails at this step. For a new database run ``make db-init`` and then ``alembic
+stamp head``.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the filter options materialized view."""
+    # Query must match SONG_FILTER_OPTIONS_QUERY in app.models.song
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW songs_filter_options AS
+        SELECT
+            1 AS id,
+            ARRAY(SELECT DISTINCT genre FROM songs
+                  WHERE is_public = true AND genre IS NOT NULL ORDER BY genre) AS genres,
+            ARRAY(SELECT artist FROM songs WHERE is_public = true
+                  GROUP BY artist ORDER BY count(*) DESC, artist LIMIT 50) AS artists,
+            ARRAY(SELECT album FROM songs WHERE is_public = true AND album IS NOT NULL
+                  GROUP BY album ORDER BY count(*) DESC, album LIMIT 50) AS albums,
+            ARRAY(SELECT DISTINCT year FROM songs
+                  WHERE is_public = true AND year IS NOT NULL ORDER BY year) AS years,
+            ARRAY(SELECT DISTINCT difficulty FROM songs
+                  WHERE is_public = true ORDER BY difficulty) AS difficulties
+        """
+    )
+    # A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("CREATE UNIQUE INDEX ix_songs_filter_options_id ON songs_filter_options (id)")
+
+
+def downgrade() -> None:
+    """Drop the filter options materialized view."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS songs_filter_options")
@@ -8,7 +8,7 @@ from pathlib import Path
 # Add the src directory to the Python path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from app.database import create_tables, drop_tables
+from app.database import SessionLocal, create_tables, drop_tables
 
 
 def run_alembic_command(command: str) -> int:
@@ -63,6 +63,19 @@ def show_current():
     return run_alembic_command("current")
 
 
+def refresh_filter_options():
+    """Refresh the songs_filter_options materialized view (run periodically, e.g. from cron)."""
+    from app.services.song_service import get_song_service
+
+    print("Refreshing song filter options...")
+    db = SessionLocal()
+    try:
+        get_song_service().refresh_filter_options(db)
+    finally:
+        db.close()
+    print("Song filter options refreshed successfully!")
+
+
 def main():
     """Main migration script."""
     if len(sys.argv) < 2:
@@ -75,6 +88,7 @@ def main():
         print("  downgrade [revision]    - Downgrade database")
         print("  history                 - Show migration history")
         print("  current                 - Show current migration")
+        print("  refresh-filter-options  - Refresh song filter options view")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -99,6 +113,8 @@ def main():
         sys.exit(show_history())
     elif command == "current":
         sys.exit(show_current())
+    elif command == "refresh-filter-options":
+        refresh_filter_options()
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
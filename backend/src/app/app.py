@@ -8,7 +8,7 @@ from flask_jwt_extended import JWTManager
 from flask_restx import Api, Resource
 
 from .auth import AuthConfig
-from .database import create_tables
+from .database import close_request_db, create_tables
 from .routes.auth import auth_ns
 from .routes.songs import songs_ns
 from .routes.admin import admin_ns
@@ -28,6 +28,12 @@ def create_app(config_name: str = None) -> Flask:
     app.config["JWT_ACCESS_TOKEN_LOCATION"] = AuthConfig.JWT_ACCESS_TOKEN_LOCATION
     app.config["JWT_COOKIE_SECURE"] = AuthConfig.JWT_COOKIE_SECURE
     app.config["JWT_COOKIE_CSRF_PROTECT"] = AuthConfig.JWT_COOKIE_CSRF_PROTECT
+    app.config["LOG_REQUEST_BODY_ON_ERROR"] = (
+        os.getenv("LOG_REQUEST_BODY_ON_ERROR", "False").lower() == "true"
+    )
+    app.config["OPTIMIZE_PAGINATION_FOR_SPEED"] = (
+        os.getenv("OPTIMIZE_PAGINATION_FOR_SPEED", "False").lower() == "true"
+    )
 
     # CORS configuration
     CORS(app, origins=["http://localhost:3000", "http://localhost:8080"])
@@ -48,6 +54,9 @@ def create_app(config_name: str = None) -> Flask:
     # Register error handlers
     register_error_handlers(app)
 
+    # Close each request's database session when its app context ends
+    app.teardown_appcontext(close_request_db)
+
     # Register namespaces
     api.add_namespace(auth_ns)
     api.add_namespace(songs_ns)
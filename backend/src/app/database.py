@@ -1,8 +1,9 @@
 """Database configuration and connection management."""
 
 import os
-from typing import Generator
+from typing import Generator, Optional
 
+from flask import g
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
@@ -34,6 +35,20 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_request_db() -> Session:
+    """Get the database session for the current request, creating it on first use."""
+    if "db" not in g:
+        g.db = SessionLocal()
+    return g.db
+
+
+def close_request_db(exception: Optional[BaseException] = None) -> None:
+    """Close the current request's session; registered as an app-context teardown."""
+    db = g.pop("db", None)
+    if db is not None:
+        db.close()
+
+
 def create_tables():
     """Create all tables in the database."""
     Base.metadata.create_all(bind=engine)
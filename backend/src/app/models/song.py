@@ -4,17 +4,102 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text, ForeignKey, Boolean
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    CheckConstraint,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, relationship
 
 from ..database import Base
 
+# Full-text search documents. Queries must use these exact expressions for
+# PostgreSQL to match them against the GIN expression indexes below.
+SONG_SEARCH_DOCUMENT = (
+    "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(artist, '') "
+    "|| ' ' || coalesce(album, ''))"
+)
+SONG_LYRICS_DOCUMENT = "to_tsvector('english', coalesce(lyrics, ''))"
+
+# Single-row materialized view of filter dropdown values over public songs (see migration 005).
+# Refreshed out of band by ``scripts/migrate.py refresh-filter-options``.
+SONG_FILTER_OPTIONS_VIEW = "songs_filter_options"
+SONG_FILTER_OPTIONS_QUERY = """
+SELECT
+    1 AS id,
+    ARRAY(SELECT DISTINCT genre FROM songs
+          WHERE is_public = true AND genre IS NOT NULL ORDER BY genre) AS genres,
+    ARRAY(SELECT artist FROM songs WHERE is_public = true
+          GROUP BY artist ORDER BY count(*) DESC, artist LIMIT 50) AS artists,
+    ARRAY(SELECT album FROM songs WHERE is_public = true AND album IS NOT NULL
+          GROUP BY album ORDER BY count(*) DESC, album LIMIT 50) AS albums,
+    ARRAY(SELECT DISTINCT year FROM songs
+          WHERE is_public = true AND year IS NOT NULL ORDER BY year) AS years,
+    ARRAY(SELECT DISTINCT difficulty FROM songs
+          WHERE is_public = true ORDER BY difficulty) AS difficulties
+"""
+
 
 class Song(Base):
     """Represents a song in the GuitarTab Pro application."""
 
     __tablename__ = "songs"
+    __table_args__ = (
+        CheckConstraint("rating >= 0 AND rating <= 5", name="ck_songs_rating_range"),
+        # PostgreSQL-only search indexes (see migration 003)
+        Index(
+            "ix_songs_search", text(SONG_SEARCH_DOCUMENT), postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_songs_lyrics_search", text(SONG_LYRICS_DOCUMENT), postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_songs_artist_trgm",
+            "artist",
+            postgresql_using="gin",
+            postgresql_ops={"artist": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_songs_album_trgm",
+            "album",
+            postgresql_using="gin",
+            postgresql_ops={"album": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_songs_genre_trgm",
+            "genre",
+            postgresql_using="gin",
+            postgresql_ops={"genre": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Public listing indexes (see migration 004); predicates mirror SongService filters
+        Index(
+            "ix_songs_public_views",
+            text("views DESC"),
+            postgresql_where=text("is_public = true"),
+        ),
+        Index(
+            "ix_songs_public_rating",
+            text("rating DESC"),
+            postgresql_where=text("is_public = true AND rating > 0"),
+        ),
+        Index(
+            "ix_songs_public_created",
+            text("created_at DESC"),
+            postgresql_where=text("is_public = true"),
+        ),
+        Index("ix_songs_user", "user_id"),
+    )
 
     id: UUID = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: UUID = Column(
@@ -164,4 +249,28 @@ class Song(Base):
     def __repr__(self):
         visibility = "Public" if self.is_public else "Private"
         flagged = " (Flagged)" if self.is_flagged else ""
-        return f"<Song(title='{self.title}', artist='{self.artist}' {visibility}{flagged})>"
\ No newline at end of file
+        return f"<Song(title='{self.title}', artist='{self.artist}' {visibility}{flagged})>"
+
+
+# The trigram indexes need pg_trgm; create it ahead of the table when using create_all
+event.listen(
+    Song.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# Keep create_all/drop_all in step with migration 005's materialized view
+for statement in (
+    f"CREATE MATERIALIZED VIEW {SONG_FILTER_OPTIONS_VIEW} AS {SONG_FILTER_OPTIONS_QUERY}",
+    f"CREATE UNIQUE INDEX ix_{SONG_FILTER_OPTIONS_VIEW}_id ON {SONG_FILTER_OPTIONS_VIEW} (id)",
+):
+    event.listen(
+        Song.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
+event.listen(
+    Song.__table__,
+    "before_drop",
+    DDL(f"DROP MATERIALIZED VIEW IF EXISTS {SONG_FILTER_OPTIONS_VIEW}").execute_if(
+        dialect="postgresql"
+    ),
+)
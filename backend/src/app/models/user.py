@@ -3,7 +3,7 @@
 import uuid
 import json
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, FrozenSet
 
 from sqlalchemy import Column, DateTime, String, Boolean, Text, JSON
 from sqlalchemy.dialects.postgresql import UUID
@@ -86,7 +86,16 @@ class User(Base):
             return True
         
         # Check explicit permissions
-        return permission in self.permissions.get('explicit', [])
+        return permission in self.permissions_set
+
+    @property
+    def permissions_set(self) -> FrozenSet[str]:
+        """Explicit permissions as a frozenset, built on first access and cached on the instance."""
+        permissions_set = self.__dict__.get('_permissions_set')
+        if permissions_set is None:
+            permissions_set = frozenset((self.permissions or {}).get('explicit', ()))
+            self.__dict__['_permissions_set'] = permissions_set
+        return permissions_set
 
     def can_read_resource(self, resource_user_id: UUID) -> bool:
         """Check if user can read a resource."""
@@ -145,6 +154,7 @@ class User(Base):
             self.permissions['explicit'] = []
         if permission not in self.permissions['explicit']:
             self.permissions['explicit'].append(permission)
+        self.__dict__.pop('_permissions_set', None)
 
     def remove_permission(self, permission: str) -> None:
         """Remove a specific permission from user."""
@@ -152,6 +162,7 @@ class User(Base):
             self.permissions['explicit'] = [
                 p for p in self.permissions['explicit'] if p != permission
             ]
+        self.__dict__.pop('_permissions_set', None)
 
     def update_role(self, new_role: str) -> None:
         """Update user role."""
@@ -168,6 +179,7 @@ class User(Base):
         
         # Clear explicit permissions on role change
         self.permissions = {'explicit': []}
+        self.__dict__.pop('_permissions_set', None)
 
     def to_dict(self, include_sensitive: bool = False) -> Dict[str, Any]:
         """Convert user to dictionary."""
@@ -7,16 +7,17 @@ from flask import request, jsonify
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from flask_restx import Namespace, Resource, fields
 
-from ..database import get_db
+from ..database import get_request_db
 from ..models.user import User
 from ..models.song import Song
 from ..services.user_service import UserService
-from ..services.song_service import SongService
+from ..services.song_service import get_song_service
 from ..utils.exceptions import (
     NotFoundError,
     PermissionDeniedError,
     ValidationError,
 )
+from ..utils.pagination import parse_pagination_args
 from ..utils.responses import APIResponse, ErrorResponse
 from ..utils.auth_decorators import require_admin, AuthorizationManager
 
@@ -26,7 +27,7 @@ admin_ns = Namespace("admin", description="Administrator operations")
 
 # Initialize services
 user_service = UserService()
-song_service = SongService()
+song_service = get_song_service()
 
 
 @admin_ns.route("/users")
@@ -36,8 +37,7 @@ class AdminUserManagement(Resource):
     def get(self):
         """List all users (admin only)."""
         try:
-            page = int(request.args.get('page', 1))
-            per_page = int(request.args.get('per_page', 20))
+            page, per_page = parse_pagination_args(request.args)
             search = request.args.get('search')
             role = request.args.get('role')
             is_active = request.args.get('is_active')
@@ -46,13 +46,13 @@ class AdminUserManagement(Resource):
             if is_active is not None:
                 is_active = is_active.lower() in ['true', '1', 'yes']
             
-            db = get_db()
+            db = get_request_db()
             current_user_id = UUID(get_jwt_identity())
             
             users, total = user_service.list_users(
                 db=db,
                 page=page,
-                per_page=min(per_page, 100),
+                per_page=per_page,
                 search=search,
                 role=role,
                 is_active=is_active,
@@ -110,7 +110,7 @@ class AdminRoleManagement(Resource):
                     "role": f"Invalid role. Valid roles: {valid_roles}"
                 })
             
-            db = get_db()
+            db = get_request_db()
             current_admin_id = UUID(get_jwt_identity())
             
             updated_user = user_service.update_user_role(db, user_id, new_role, current_admin_id)
@@ -139,7 +139,7 @@ class AdminUserActivation(Resource):
     def post(self, user_id: UUID):
         """Activate user account (admin only)."""
         try:
-            db = get_db()
+            db = get_request_db()
             current_admin_id = UUID(get_jwt_identity())
             
             activated_user = user_service.activate_user(db, user_id, current_admin_id)
@@ -161,7 +161,7 @@ class AdminUserActivation(Resource):
     def delete(self, user_id: UUID):
         """Deactivate user account (admin only)."""
         try:
-            db = get_db()
+            db = get_request_db()
             current_admin_id = UUID(get_jwt_identity())
             
             deactivated_user = user_service.deactivate_user(db, user_id, current_admin_id)
@@ -186,7 +186,7 @@ class AdminUserStats(Resource):
     def get(self, user_id: UUID):
         """Get comprehensive user statistics (admin only)."""
         try:
-            db = get_db()
+            db = get_request_db()
             current_admin_id = UUID(get_jwt_identity())
             
             stats = user_service.get_user_stats(db, user_id, current_admin_id)
@@ -208,7 +208,7 @@ class AdminUserPromotion(Resource):
     def post(self, user_id: UUID):
         """Promote user to moderator (admin only)."""
         try:
-            db = get_db()
+            db = get_request_db()
             current_admin_id = UUID(get_jwt_identity())
             
             promoted_user = user_service.promote_to_moderator(db, user_id, current_admin_id)
@@ -230,7 +230,7 @@ class AdminUserPromotion(Resource):
     def delete(self, user_id: UUID):
         """Demote moderator to user (admin only)."""
         try:
-            db = get_db()
+            db = get_request_db()
             current_admin_id = UUID(get_jwt_identity())
             
             demoted_user = user_service.demote_from_moderator(db, user_id, current_admin_id)
@@ -255,7 +255,7 @@ class AdminSystemStats(Resource):
     def get(self):
         """Get system-wide statistics (admin only)."""
         try:
-            db = get_db()
+            db = get_request_db()
             
             # User statistics
             total_users = db.query(func.count(User.id)).scalar()
@@ -317,7 +317,7 @@ class AdminModeration(Resource):
     def get(self):
         """Get songs pending moderation (admin only)."""
         try:
-            db = get_db()
+            db = get_request_db()
             
             flagged_songs = db.query(Song).filter(Song.is_flagged == True).all()
             
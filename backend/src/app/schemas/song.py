@@ -1,13 +1,64 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, List, Literal, Optional, Type
 from uuid import UUID
 
-from pydantic import BaseModel, Field, HttpUrl, root_validator, validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    TypeAdapter,
+    field_validator,
+    model_validator,
+)
 
 # Max content size for lyrics, chords, tab (50KB)
 MAX_CONTENT_SIZE_KB = 50
 MAX_CONTENT_SIZE_BYTES = MAX_CONTENT_SIZE_KB * 1024
 
+# Upper bound for year fields, fixed for the lifetime of the process
+CURRENT_YEAR = datetime.now(timezone.utc).year
+
+# Accepted sort parameters; Literal validation is a set lookup rather than a regex match
+SortBy = Literal["title", "artist", "created_at", "views", "rating", "difficulty", "year"]
+SortOrder = Literal["asc", "desc"]
+
+# (min, max) field pairs checked by SongQueryParams.validate_ranges
+_RANGE_FIELDS = (
+    ("difficulty_min", "difficulty_max"),
+    ("year_from", "year_to"),
+    ("rating_min", "rating_max"),
+)
+
+
+@lru_cache(maxsize=16)
+def get_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """Return a cached TypeAdapter for validating and dumping a schema."""
+    return TypeAdapter(schema)
+
+
+def _check_source_url(v: Optional[str]) -> Optional[str]:
+    """Reject malformed source URLs while keeping the value a plain string."""
+    if v is not None:
+        get_adapter(HttpUrl).validate_python(v)
+    return v
+
+
+def _check_content_size(v: Optional[str]) -> Optional[str]:
+    """Reject lyrics/chords/tab content larger than MAX_CONTENT_SIZE_KB of UTF-8."""
+    # UTF-8 needs at most 4 bytes per code point, so short content always fits
+    if v is None or len(v) <= MAX_CONTENT_SIZE_BYTES // 4:
+        return v
+    # ASCII is one byte per code point; only encode when it can't be known cheaply
+    size = len(v) if v.isascii() else len(v.encode("utf-8"))
+    if size > MAX_CONTENT_SIZE_BYTES:
+        raise ValueError(
+            f"Content exceeds {MAX_CONTENT_SIZE_KB}KB limit. "
+            f"Current size: {size / 1024:.2f}KB"
+        )
+    return v
+
 
 class SongBaseSchema(BaseModel):
     """Base schema for song data."""
@@ -40,27 +91,23 @@ class SongBaseSchema(BaseModel):
         None, max_length=100, example="Classic Rock"
     )
     year: Optional[int] = Field(
-        None, ge=1900, le=datetime.now().year, example=1971
+        None, ge=1900, le=CURRENT_YEAR, example=1971
     )
-    source_url: Optional[HttpUrl] = Field(
+    source_url: Optional[str] = Field(
         None, example="https://www.ultimate-guitar.com/tabs/l/led_zeppelin/stairway_to_heaven_tab.htm"
     )
     difficulty: int = Field(
         1, ge=1, le=5, example=3, description="Difficulty on a scale of 1 to 5"
     )
 
-    @validator("lyrics", "chords", "tab", pre=True, always=True)
+    @field_validator("lyrics", "chords", "tab", mode="before")
+    @classmethod
     def check_content_size(cls, v):
-        if v is not None and len(v.encode("utf-8")) > MAX_CONTENT_SIZE_BYTES:
-            raise ValueError(
-                f"Content exceeds {MAX_CONTENT_SIZE_KB}KB limit. "
-                f"Current size: {len(v.encode('utf-8')) / 1024:.2f}KB"
-            )
-        return v
+        return _check_content_size(v)
 
-    class Config:
-        from_attributes = True  # Changed from orm_mode = True for Pydantic v2
-        json_schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "examples": [
                 {
                     "title": "Stairway to Heaven",
@@ -75,23 +122,45 @@ class SongBaseSchema(BaseModel):
                     "difficulty": 3,
                 }
             ]
-        }
+        },
+    )
 
 
 class SongCreateSchema(SongBaseSchema):
     """Schema for creating a new song."""
     # All fields from SongBaseSchema are required for creation unless explicitly made optional here
-    pass
 
+    @field_validator("source_url")
+    @classmethod
+    def check_source_url(cls, v):
+        return _check_source_url(v)
+
+
+class SongUpdateSchema(BaseModel):
+    """Schema for updating an existing song; only the fields sent are validated and applied."""
 
-class SongUpdateSchema(SongBaseSchema):
-    """Schema for updating an existing song."""
     title: Optional[str] = Field(None, min_length=1, max_length=255)
     artist: Optional[str] = Field(None, min_length=1, max_length=255)
-    # Other fields are already Optional in SongBaseSchema or explicitly made optional here
-
-    class Config:
-        extra = "forbid"  # Forbid extra fields not defined in the schema
+    album: Optional[str] = Field(None, max_length=255)
+    lyrics: Optional[str] = Field(None, max_length=MAX_CONTENT_SIZE_BYTES)
+    chords: Optional[str] = Field(None, max_length=MAX_CONTENT_SIZE_BYTES)
+    tab: Optional[str] = Field(None, max_length=MAX_CONTENT_SIZE_BYTES)
+    genre: Optional[str] = Field(None, max_length=100)
+    year: Optional[int] = Field(None, ge=1900, le=CURRENT_YEAR)
+    source_url: Optional[str] = None
+    difficulty: Optional[int] = Field(None, ge=1, le=5)
+
+    model_config = ConfigDict(from_attributes=True, extra="forbid")
+
+    @model_validator(mode="after")
+    def check_present_fields(self):
+        # Only fields the client actually sent need checking
+        for name in self.model_fields_set:
+            if name in ("lyrics", "chords", "tab"):
+                _check_content_size(getattr(self, name))
+            elif name == "source_url":
+                _check_source_url(self.source_url)
+        return self
 
 
 class SongResponseSchema(SongBaseSchema):
@@ -104,9 +173,9 @@ class SongResponseSchema(SongBaseSchema):
     created_at: datetime = Field(..., example="2023-01-01T12:00:00Z")
     updated_at: datetime = Field(..., example="2023-01-01T12:30:00Z")
 
-    class Config:
-        from_attributes = True
-        json_schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "examples": [
                 {
                     "id": "123e4567-e89b-12d3-a456-426614174000",
@@ -127,20 +196,59 @@ class SongResponseSchema(SongBaseSchema):
                     "updated_at": "2023-01-01T12:30:00Z",
                 }
             ]
-        }
+        },
+    )
+
+    @classmethod
+    def from_song(cls, song: Any) -> "SongResponseSchema":
+        """
+        Build a response from a Song row without running validators.
+
+        Trust boundary: only use this for rows loaded from our own database,
+        which were validated when written. Untrusted input must go through
+        SongCreateSchema/SongUpdateSchema validation instead.
+        """
+        return cls.model_construct(**{name: getattr(song, name) for name in SONG_RESPONSE_FIELDS})
+
+
+# Fields read off a Song row by SongResponseSchema.from_song, resolved once at import
+SONG_RESPONSE_FIELDS = tuple(SongResponseSchema.model_fields)
+
+
+class SongListItemSchema(BaseModel):
+    """Schema for a song in list responses; omits the large lyrics/chords/tab fields."""
+
+    id: UUID
+    user_id: UUID
+    title: str
+    artist: str
+    album: Optional[str] = None
+    genre: Optional[str] = None
+    year: Optional[int] = None
+    source_url: Optional[str] = None
+    difficulty: int = 1
+    views: int = 0
+    rating: float = 0.0
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Fields emitted per song by list endpoints
+SONG_LIST_FIELDS = tuple(SongListItemSchema.model_fields)
 
 
 class SongListResponseSchema(BaseModel):
     """Schema for paginated list of songs."""
 
-    items: List[SongResponseSchema]
+    items: List[SongListItemSchema]
     total: int = Field(..., ge=0)
     page: int = Field(..., ge=1)
     per_page: int = Field(..., ge=1)
     pages: int = Field(..., ge=0)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SongQueryParams(BaseModel):
@@ -148,14 +256,8 @@ class SongQueryParams(BaseModel):
 
     page: int = Field(1, ge=1, description="Page number for pagination")
     per_page: int = Field(25, ge=1, le=100, description="Items per page")
-    sort_by: Optional[str] = Field(
-        "created_at",
-        pattern="^(title|artist|created_at|views|rating|difficulty|year)$",
-        description="Field to sort by",
-    )
-    sort_order: Optional[str] = Field(
-        "desc", pattern="^(asc|desc)$", description="Sort order (asc or desc)"
-    )
+    sort_by: SortBy = Field("created_at", description="Field to sort by")
+    sort_order: SortOrder = Field("desc", description="Sort order (asc or desc)")
     search: Optional[str] = Field(
         None,
         min_length=1,
@@ -172,10 +274,10 @@ class SongQueryParams(BaseModel):
         None, ge=1, le=5, description="Maximum difficulty level"
     )
     year_from: Optional[int] = Field(
-        None, ge=1900, le=datetime.now().year, description="Filter by year from"
+        None, ge=1900, le=CURRENT_YEAR, description="Filter by year from"
     )
     year_to: Optional[int] = Field(
-        None, ge=1900, le=datetime.now().year, description="Filter by year to"
+        None, ge=1900, le=CURRENT_YEAR, description="Filter by year to"
     )
     rating_min: Optional[float] = Field(
         None, ge=0.0, le=5.0, description="Minimum rating"
@@ -190,30 +292,14 @@ class SongQueryParams(BaseModel):
         None, description="Filter by public/private status"
     )
 
-    @root_validator(pre=True)
-    def validate_difficulty_range(cls, values):
-        min_val = values.get("difficulty_min")
-        max_val = values.get("difficulty_max")
-        if min_val is not None and max_val is not None and min_val > max_val:
-            raise ValueError("difficulty_min cannot be greater than difficulty_max")
-        return values
-
-    @root_validator(pre=True)
-    def validate_year_range(cls, values):
-        min_val = values.get("year_from")
-        max_val = values.get("year_to")
-        if min_val is not None and max_val is not None:
-            if min_val > max_val:
-                raise ValueError("year_from cannot be greater than year_to")
-        return values
-
-    @root_validator(pre=True)
-    def validate_rating_range(cls, values):
-        min_val = values.get("rating_min")
-        max_val = values.get("rating_max")
-        if min_val is not None and max_val is not None and min_val > max_val:
-            raise ValueError("rating_min cannot be greater than rating_max")
-        return values
+    @model_validator(mode="after")
+    def validate_ranges(self):
+        for min_field, max_field in _RANGE_FIELDS:
+            min_val = getattr(self, min_field)
+            max_val = getattr(self, max_field)
+            if min_val is not None and max_val is not None and min_val > max_val:
+                raise ValueError(f"{min_field} cannot be greater than {max_field}")
+        return self
 
 
 class AdvancedSearchParams(BaseModel):
@@ -223,8 +309,8 @@ class AdvancedSearchParams(BaseModel):
     artist: Optional[str] = Field(None, description="Specific artist name")
     album: Optional[str] = Field(None, description="Specific album name")
     genre: Optional[List[str]] = Field(None, description="List of genres to filter by")
-    year_from: Optional[int] = Field(None, ge=1900, le=datetime.now().year)
-    year_to: Optional[int] = Field(None, ge=1900, le=datetime.now().year)
+    year_from: Optional[int] = Field(None, ge=1900, le=CURRENT_YEAR)
+    year_to: Optional[int] = Field(None, ge=1900, le=CURRENT_YEAR)
     difficulty_range: Optional[List[int]] = Field(None, description="Difficulty levels [1,2,3,4,5]")
     rating_min: Optional[float] = Field(None, ge=0.0, le=5.0)
     rating_max: Optional[float] = Field(None, ge=0.0, le=5.0)
@@ -239,24 +325,27 @@ class AdvancedSearchParams(BaseModel):
     per_page: int = Field(20, ge=1, le=100)
     
     # Sorting
-    sort_by: str = Field("created_at", pattern="^(title|artist|created_at|views|rating|difficulty|year)$")
-    sort_order: str = Field("desc", pattern="^(asc|desc)$")
+    sort_by: SortBy = "created_at"
+    sort_order: SortOrder = "desc"
 
 
 class BulkUpdateSchema(BaseModel):
     """Schema for bulk song updates."""
     
-    songs: List[dict] = Field(..., description="List of song update objects")
+    songs: List[dict] = Field(
+        ..., description="List of song update objects: an id plus SongUpdateSchema fields"
+    )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "songs": [
                     {"id": "song-uuid-1", "genre": "Rock", "difficulty": 3},
-                    {"id": "song-uuid-2", "rating": 4.5, "views": 100},
+                    {"id": "song-uuid-2", "title": "New Title", "year": 1999},
                 ]
             }
-        }
+        },
+    )
 
 
 class FilterOptionsSchema(BaseModel):
@@ -268,8 +357,8 @@ class FilterOptionsSchema(BaseModel):
     years: List[int] = Field(..., description="Available years")
     difficulties: List[int] = Field(..., description="Available difficulty levels")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "genres": ["Rock", "Pop", "Classical", "Jazz"],
                 "artists": ["Led Zeppelin", "The Beatles", "Pink Floyd"],
@@ -277,4 +366,5 @@ class FilterOptionsSchema(BaseModel):
                 "years": [1970, 1971, 1972, 1973],
                 "difficulties": [1, 2, 3, 4, 5],
             }
-        }
\ No newline at end of file
+        },
+    )
\ No newline at end of file
@@ -1,16 +1,39 @@
 """Song service with business logic and data access."""
 
-from typing import List, Optional, Tuple
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, get_args
 from uuid import UUID
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_
-
-from ..models.song import Song
-from ..schemas.song import SongCreateSchema, SongUpdateSchema, SongQueryParams
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import func, literal, literal_column, or_, and_, select, text, update
+
+from ..models.song import (
+    SONG_FILTER_OPTIONS_VIEW,
+    SONG_LYRICS_DOCUMENT,
+    SONG_SEARCH_DOCUMENT,
+    Song,
+)
+from ..schemas.song import (
+    SongCreateSchema,
+    SongQueryParams,
+    SongUpdateSchema,
+    SortBy,
+    SortOrder,
+    get_adapter,
+)
 from ..utils.exceptions import NotFoundError, PermissionDeniedError, ValidationError
+from ..utils.pagination import AdvancedPagination, fetch_page_with_total
 from .base_service import BaseService
 
+# ORDER BY clause for every accepted (sort_by, sort_order) pair, built once at import
+# Each sort ends with the primary key so the ordering is total and deep pages can seek by keyset
+_SORT_CLAUSES = {
+    (field, order): (getattr(getattr(Song, field), order)(), getattr(Song.id, order)())
+    for field in get_args(SortBy)
+    for order in get_args(SortOrder)
+}
+
 
 class SongService(BaseService[Song]):
     """
@@ -23,7 +46,33 @@ class SongService(BaseService[Song]):
 
     def create_song(self, db: Session, song_in: SongCreateSchema, user_id: UUID) -> Song:
         """Create a new song for a given user."""
-        return self.create(db, song_in.model_dump(), user_id)
+        return self.create(db, get_adapter(type(song_in)).dump_python(song_in), user_id)
+
+    def _search_filter(self, db: Session, search_term: str, include_lyrics: bool = False):
+        """
+        Build a text-search condition over title, artist and album (and lyrics).
+
+        On PostgreSQL this is a full-text match served by the GIN expression
+        indexes on songs; other databases fall back to ILIKE substring matching.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            ts_query = func.plainto_tsquery("english", search_term)
+            conditions = [literal_column(SONG_SEARCH_DOCUMENT).op("@@")(ts_query)]
+            if include_lyrics:
+                conditions.append(literal_column(SONG_LYRICS_DOCUMENT).op("@@")(ts_query))
+            return or_(*conditions)
+
+        pattern = f"%{search_term}%"
+        columns = [self.model.title, self.model.artist, self.model.album]
+        if include_lyrics:
+            columns.append(self.model.lyrics)
+        return or_(*(column.ilike(pattern) for column in columns))
+
+    def _list_query(self, db: Session):
+        """Query songs for list responses, leaving the large text columns unloaded."""
+        return db.query(self.model).options(
+            defer(self.model.lyrics), defer(self.model.chords), defer(self.model.tab)
+        )
 
     def get_song(self, db: Session, song_id: UUID) -> Song:
         """Retrieve a single song by its ID."""
@@ -32,14 +81,11 @@ class SongService(BaseService[Song]):
             raise NotFoundError(f"Song with ID {song_id} not found.")
         return song
 
-    def list_songs(
+    def _filtered_list_query(
         self, db: Session, query_params: SongQueryParams, current_user_id: Optional[UUID] = None
-    ) -> Tuple[List[Song], int]:
-        """
-        Retrieve a list of songs based on various query parameters,
-        including search, filters, pagination, and sorting.
-        """
-        query = db.query(self.model)
+    ):
+        """Apply a list request's scope and filters, without sorting or pagination."""
+        query = self._list_query(db)
 
         # Apply scope filtering
         if query_params.user_id:
@@ -52,13 +98,7 @@ class SongService(BaseService[Song]):
 
         # Apply search filter
         if query_params.search:
-            search = f"%{query_params.search}%"
-            search_filter = or_(
-                self.model.title.ilike(search),
-                self.model.artist.ilike(search),
-                self.model.album.ilike(search)
-            )
-            query = query.filter(search_filter)
+            query = query.filter(self._search_filter(db, query_params.search))
 
         # Apply genre filter
         if query_params.genre:
@@ -80,59 +120,147 @@ class SongService(BaseService[Song]):
         if query_params.is_public is not None:
             query = query.filter(self.model.is_public == query_params.is_public)
 
-        total = query.count()
+        return query
+
+    def list_songs(
+        self,
+        db: Session,
+        query_params: SongQueryParams,
+        current_user_id: Optional[UUID] = None,
+        total: Optional[int] = None
+    ) -> Tuple[List[Song], int]:
+        """
+        Retrieve a list of songs based on various query parameters,
+        including search, filters, pagination, and sorting.
+
+        ``total`` is the match count if the caller already has it (e.g. from
+        list_songs_version), which skips counting again.
+        """
+        query = self._filtered_list_query(db, query_params, current_user_id)
 
         # Apply sorting
         if query_params.sort_by:
-            sort_column = getattr(self.model, query_params.sort_by)
-            if query_params.sort_order == "desc":
-                query = query.order_by(sort_column.desc())
-            else:
-                query = query.order_by(sort_column.asc())
+            query = query.order_by(*_SORT_CLAUSES[query_params.sort_by, query_params.sort_order])
 
-        # Apply pagination
-        songs = query.offset((query_params.page - 1) * query_params.per_page).limit(
-            query_params.per_page
-        ).all()
+        # Apply pagination; deep pages on a NOT NULL sort column seek by keyset
+        songs, pagination = AdvancedPagination.offset_based_paginate(
+            query, query_params.page, query_params.per_page, total=total
+        )
 
-        return songs, total
+        return songs, pagination.total
+
+    def list_songs_version(
+        self, db: Session, query_params: SongQueryParams, current_user_id: Optional[UUID] = None
+    ) -> Tuple[int, Optional[datetime]]:
+        """
+        Return the row count and latest updated_at of the songs a list request matches.
+
+        Any insert, delete or edit of a matching song changes one of the two, so
+        they can answer If-None-Match before the page is queried and serialized.
+        """
+        statement = self._filtered_list_query(db, query_params, current_user_id).statement
+        count, last_updated = db.execute(
+            statement.with_only_columns(
+                func.count(), func.max(self.model.updated_at), maintain_column_froms=True
+            ).order_by(None)
+        ).one()
+        return count, last_updated
+
+    def _check_owner(self, db: Session, song_id: UUID, user_id: UUID, action: str) -> None:
+        """Verify ownership by selecting only songs.user_id, not the full row."""
+        owner_id = db.query(self.model.user_id).filter(self.model.id == song_id).scalar()
+        if owner_id is None:
+            raise NotFoundError(f"Song with ID {song_id} not found.")
+        if owner_id != user_id:
+            raise PermissionDeniedError(f"You do not have permission to {action} this song.")
 
     def update_song(
         self, db: Session, song_id: UUID, song_in: SongUpdateSchema, user_id: UUID
     ) -> Song:
         """Update an existing song, ensuring ownership."""
-        db_song = self.get_song(db, song_id)
-        if db_song.user_id != user_id:
-            raise PermissionDeniedError("You do not have permission to update this song.")
-        return self.update(db, db_song, song_in.model_dump(exclude_unset=True), user_id)
+        self._check_owner(db, song_id, user_id, "update")
+        update_data = get_adapter(type(song_in)).dump_python(song_in, exclude_unset=True)
+        if not update_data:
+            return self.get_song(db, song_id)
+
+        # Ownership is re-checked in the WHERE clause so the write itself is guarded
+        stmt = (
+            update(self.model)
+            .where(self.model.id == song_id, self.model.user_id == user_id)
+            .values(**update_data)
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        song = db.scalars(stmt).one_or_none()
+        if song is None:
+            db.rollback()
+            raise NotFoundError(f"Song with ID {song_id} not found.")
+        db.commit()
+        return song
 
-    def delete_song(self, db: Session, song_id: UUID, user_id: UUID):
+    def delete_song(self, db: Session, song_id: UUID, user_id: UUID) -> None:
         """Delete a song, ensuring ownership."""
-        db_song = self.get_song(db, song_id)
-        if db_song.user_id != user_id:
-            raise PermissionDeniedError("You do not have permission to delete this song.")
-        return self.delete(db, db_song, user_id)
-
-    def increment_view_count(self, db: Session, song_id: UUID) -> Song:
-        """Increment the view count for a song."""
-        song = self.get_song(db, song_id)
-        song.views += 1
+        deleted = db.query(self.model).filter(
+            self.model.id == song_id, self.model.user_id == user_id
+        ).delete(synchronize_session=False)
+        if not deleted:
+            db.rollback()
+            # Nothing matched: tell a missing song apart from someone else's song
+            self._check_owner(db, song_id, user_id, "delete")
         db.commit()
-        db.refresh(song)
-        return song
 
-    def update_rating(self, db: Session, song_id: UUID, new_rating: float) -> Song:
-        """Update the rating for a song."""
-        song = self.get_song(db, song_id)
-        song.rating = new_rating
+    def increment_view_count(self, db: Session, song_id: UUID) -> None:
+        """
+        Increment the view count for a song.
+
+        A single UPDATE ... SET views = views + 1 keeps concurrent views from
+        being lost. updated_at is bumped by the column's onupdate, as with
+        Song.increment_views; the song's ETag is derived from the body anyway.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id == song_id)
+            .values(views=self.model.views + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if not db.execute(stmt).rowcount:
+            db.rollback()
+            raise NotFoundError(f"Song with ID {song_id} not found.")
         db.commit()
-        db.refresh(song)
-        return song
+
+    def update_rating(self, db: Session, song_id: UUID, new_rating: float) -> float:
+        """
+        Fold a new rating into the song's running average.
+
+        The average is recomputed in a single UPDATE ... RETURNING so concurrent
+        ratings cannot overwrite each other. The WHERE clause only matches a
+        rating within 0-5 (NaN included, which binds as NULL on some drivers),
+        and the ck_songs_rating_range constraint guards the stored average.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id == song_id, literal(new_rating).between(0.0, 5.0))
+            .values(
+                rating=(self.model.rating * self.model.rating_count + new_rating)
+                / (self.model.rating_count + 1),
+                rating_count=self.model.rating_count + 1,
+            )
+            .returning(self.model.rating)
+            .execution_options(synchronize_session=False)
+        )
+        rating = db.execute(stmt).scalar_one_or_none()
+        if rating is None:
+            db.rollback()
+            if not 0.0 <= new_rating <= 5.0:
+                raise ValidationError("Rating must be between 0.0 and 5.0")
+            raise NotFoundError(f"Song with ID {song_id} not found.")
+        db.commit()
+        return rating
 
     def get_popular_songs(self, db: Session, limit: int = 10) -> List[Song]:
         """Get the most popular songs based on views."""
         return (
-            db.query(self.model)
+            self._list_query(db)
             .filter(self.model.is_public == True)
             .order_by(self.model.views.desc())
             .limit(limit)
@@ -141,8 +269,9 @@ class SongService(BaseService[Song]):
 
     def get_top_rated_songs(self, db: Session, limit: int = 10) -> List[Song]:
         """Get the highest rated songs."""
+        # Filters must match the ix_songs_public_rating partial index predicate
         return (
-            db.query(self.model)
+            self._list_query(db)
             .filter(self.model.is_public == True)
             .filter(self.model.rating > 0)
             .order_by(self.model.rating.desc())
@@ -153,38 +282,87 @@ class SongService(BaseService[Song]):
     def get_recent_songs(self, db: Session, limit: int = 10) -> List[Song]:
         """Get songs ordered by creation date."""
         return (
-            db.query(self.model)
+            self._list_query(db)
             .filter(self.model.is_public == True)
             .order_by(self.model.created_at.desc())
             .limit(limit)
             .all()
         )
 
+    def get_filter_options(self, db: Session) -> dict:
+        """
+        Get the values offered by the song filter dropdowns.
+
+        On PostgreSQL this is a single-row read from the songs_filter_options
+        materialized view; other databases aggregate over public songs directly.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            row = db.execute(
+                text(
+                    "SELECT genres, artists, albums, years, difficulties "
+                    f"FROM {SONG_FILTER_OPTIONS_VIEW}"
+                )
+            ).mappings().first()
+            if row is not None:
+                return dict(row)
+
+        def popular(column):
+            return [
+                value
+                for (value,) in db.query(column)
+                .filter(self.model.is_public == True, column.isnot(None))
+                .group_by(column)
+                .order_by(func.count().desc(), column)
+                .limit(50)
+            ]
+
+        def distinct(column):
+            return [
+                value
+                for (value,) in db.query(column)
+                .filter(self.model.is_public == True, column.isnot(None))
+                .distinct()
+                .order_by(column)
+            ]
+
+        return {
+            "genres": distinct(self.model.genre),
+            "artists": popular(self.model.artist),
+            "albums": popular(self.model.album),
+            "years": distinct(self.model.year),
+            "difficulties": distinct(self.model.difficulty),
+        }
+
+    def refresh_filter_options(self, db: Session) -> None:
+        """Rebuild the songs_filter_options materialized view (PostgreSQL only)."""
+        if db.get_bind().dialect.name != "postgresql":
+            return
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {SONG_FILTER_OPTIONS_VIEW}"))
+        db.commit()
+
     def get_artist_songs(self, db: Session, artist: str, limit: int = 20) -> Tuple[List[Song], int]:
         """Get songs by a specific artist."""
-        query = db.query(self.model).filter(
+        query = self._list_query(db).filter(
             and_(
                 self.model.artist.ilike(f"%{artist}%"),
                 self.model.is_public == True
             )
         )
         
-        total = query.count()
-        songs = query.limit(limit).all()
+        songs, total = fetch_page_with_total(query, 0, limit)
         
         return songs, total
 
     def get_genre_songs(self, db: Session, genre: str, limit: int = 20) -> Tuple[List[Song], int]:
         """Get songs in a specific genre."""
-        query = db.query(self.model).filter(
+        query = self._list_query(db).filter(
             and_(
                 self.model.genre.ilike(f"%{genre}%"),
                 self.model.is_public == True
             )
         )
         
-        total = query.count()
-        songs = query.limit(limit).all()
+        songs, total = fetch_page_with_total(query, 0, limit)
         
         return songs, total
 
@@ -204,17 +382,11 @@ class SongService(BaseService[Song]):
         limit: int = 20
     ) -> Tuple[List[Song], int]:
         """Advanced search with multiple criteria."""
-        query = db.query(self.model).filter(self.model.is_public == True)
+        query = self._list_query(db).filter(self.model.is_public == True)
 
         # Apply search term
         if search_term:
-            search_filter = or_(
-                self.model.title.ilike(f"%{search_term}%"),
-                self.model.artist.ilike(f"%{search_term}%"),
-                self.model.album.ilike(f"%{search_term}%"),
-                self.model.lyrics.ilike(f"%{search_term}%")
-            )
-            query = query.filter(search_filter)
+            query = query.filter(self._search_filter(db, search_term, include_lyrics=True))
 
         # Apply specific filters
         if artist:
@@ -244,53 +416,82 @@ class SongService(BaseService[Song]):
         if rating_max:
             query = query.filter(self.model.rating <= rating_max)
 
-        total = query.count()
-        songs = query.limit(limit).all()
+        songs, total = fetch_page_with_total(query, 0, limit)
         
         return songs, total
 
-    def bulk_update_songs(self, db: Session, song_updates: List[dict], user_id: UUID) -> List[Song]:
-        """Update multiple songs in a single transaction."""
-        updated_songs = []
+    def bulk_update_songs(
+        self, db: Session, song_updates: List[dict], user_id: UUID
+    ) -> Tuple[List[Song], List[Any]]:
+        """
+        Update multiple songs in a single transaction.
+
+        Entries are validated against SongUpdateSchema up front, the user's
+        songs among them are loaded with one IN query, changed in memory and
+        committed once. Returns the updated songs in input order and the IDs
+        of rejected entries (invalid, missing, or not owned by the user).
+        """
+        adapter = get_adapter(SongUpdateSchema)
         
+        parsed_updates = []
+        rejected_ids = []
         for update_data in song_updates:
-            song_id = update_data.get('id')
-            if not song_id:
-                continue
-            
+            entry_id = update_data.get('id') if isinstance(update_data, dict) else None
             try:
-                # Verify ownership
-                song = self.get_song(db, UUID(song_id))
-                if song.user_id != user_id:
-                    continue  # Skip songs not owned by user
-                
-                # Update the song
-                update_fields = {k: v for k, v in update_data.items() if k != 'id' and v is not None}
-                if update_fields:
-                    updated_song = self.update(db, song, update_fields, user_id)
-                    updated_songs.append(updated_song)
-                    
-            except Exception:
-                continue  # Skip songs that can't be processed
+                song_id = UUID(str(entry_id))
+                song_in = adapter.validate_python(
+                    {k: v for k, v in update_data.items() if k != 'id' and v is not None}
+                )
+            except (ValueError, TypeError):
+                rejected_ids.append(entry_id)
+                continue
+            parsed_updates.append((song_id, adapter.dump_python(song_in, exclude_unset=True)))
+        
+        if not parsed_updates:
+            return [], rejected_ids
+        
+        song_ids = {song_id for song_id, _ in parsed_updates}
+        songs_by_id = {
+            song.id: song
+            for song in db.query(self.model).filter(
+                self.model.id.in_(song_ids), self.model.user_id == user_id
+            )
+        }
         
-        return updated_songs
+        updated = {}
+        for song_id, update_fields in parsed_updates:
+            song = songs_by_id.get(song_id)
+            if song is None:
+                rejected_ids.append(str(song_id))
+                continue
+            for field, value in update_fields.items():
+                setattr(song, field, value)
+            updated[song_id] = song
+        
+        db.commit()
+        if not updated:
+            return [], rejected_ids
+        
+        # Commit expires the rows; refresh them all at once rather than one lazy load each
+        db.query(self.model).filter(self.model.id.in_(updated)).populate_existing().all()
+        return list(updated.values()), rejected_ids
 
     def bulk_delete_songs(self, db: Session, song_ids: List[UUID], user_id: UUID) -> int:
         """Delete multiple songs in a single transaction."""
-        deleted_count = 0
+        if not song_ids:
+            return 0
         
-        for song_id in song_ids:
-            try:
-                # Verify ownership
-                song = self.get_song(db, song_id)
-                if song.user_id != user_id:
-                    continue  # Skip songs not owned by user
-                
-                # Delete the song
-                self.delete(db, song, user_id)
-                deleted_count += 1
-                
-            except Exception:
-                continue  # Skip songs that can't be processed
+        # Songs not owned by the user are skipped by the WHERE clause
+        deleted_count = db.query(self.model).filter(
+            self.model.id.in_(song_ids),
+            self.model.user_id == user_id,
+        ).delete(synchronize_session=False)
+        db.commit()
         
-        return deleted_count
\ No newline at end of file
+        return deleted_count
+
+
+@lru_cache(maxsize=1)
+def get_song_service() -> SongService:
+    """Return the shared SongService instance."""
+    return SongService()
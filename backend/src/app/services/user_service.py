@@ -1,15 +1,24 @@
 """User service with business logic and authorization management."""
 
-from typing import List, Optional, Tuple
+import time
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
 
 from ..models.user import User
+from ..utils.auth_decorators import AuthorizationManager
 from ..utils.exceptions import NotFoundError, PermissionDeniedError, ValidationError
+from ..utils.pagination import fetch_page_with_total
 from .base_service import BaseService
 
+# Username/email -> user ID, so repeat lookups become primary-key (often identity map) hits.
+# Entries are re-checked against the loaded row, so a renamed user is never returned stale.
+_USER_ID_CACHE_TTL = 60
+_USER_ID_CACHE_MAX_SIZE = 10_000
+_user_id_cache: Dict[Tuple[str, str], Tuple[float, UUID]] = {}
+
 
 class UserService(BaseService[User]):
     """Service layer for managing user operations."""
@@ -24,13 +33,46 @@ class UserService(BaseService[User]):
             raise NotFoundError(f"User with ID {user_id} not found.")
         return user
 
+    def _is_admin(self, db: Session, user_id: UUID) -> bool:
+        """
+        Check whether a user is an administrator.
+
+        Only the is_admin column is selected, and the answer is cached in the
+        session's info dict so repeated checks within one request hit the DB once.
+        """
+        cache = db.info.setdefault("is_admin", {})
+        if user_id not in cache:
+            cache[user_id] = bool(db.query(User.is_admin).filter(User.id == user_id).scalar())
+        return cache[user_id]
+
+    def _require_admin(self, db: Session, user_id: UUID, message: str) -> None:
+        """Raise PermissionDeniedError unless the user is an administrator."""
+        if not self._is_admin(db, user_id):
+            raise PermissionDeniedError(message)
+
+    def _get_user_by_unique_field(self, db: Session, field: str, value: str) -> Optional[User]:
+        """Look up a user by a unique column, going through the user ID cache."""
+        key = (field, value)
+        cached = _user_id_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            user = db.get(User, cached[1])
+            if user is not None and getattr(user, field) == value:
+                return user
+
+        user = db.query(User).filter(getattr(User, field) == value).first()
+        if user is not None:
+            if len(_user_id_cache) >= _USER_ID_CACHE_MAX_SIZE:
+                _user_id_cache.clear()
+            _user_id_cache[key] = (time.monotonic() + _USER_ID_CACHE_TTL, user.id)
+        return user
+
     def get_user_by_username(self, db: Session, username: str) -> Optional[User]:
         """Get user by username."""
-        return db.query(User).filter(User.username == username).first()
+        return self._get_user_by_unique_field(db, "username", username)
 
     def get_user_by_email(self, db: Session, email: str) -> Optional[User]:
         """Get user by email."""
-        return db.query(User).filter(User.email == email).first()
+        return self._get_user_by_unique_field(db, "email", email)
 
     def list_users(
         self, 
@@ -46,9 +88,7 @@ class UserService(BaseService[User]):
         
         # Admin users can see all users, regular users can't list users
         if current_user_id:
-            current_user = self.get_user_by_id(db, current_user_id)
-            if not current_user.is_admin:
-                raise PermissionDeniedError("Only administrators can list users")
+            self._require_admin(db, current_user_id, "Only administrators can list users")
         
         query = db.query(User)
         
@@ -70,79 +110,72 @@ class UserService(BaseService[User]):
         if is_active is not None:
             query = query.filter(User.is_active == is_active)
         
-        total = query.count()
-        
         # Apply pagination
-        users = query.offset((page - 1) * per_page).limit(per_page).all()
+        users, total = fetch_page_with_total(query, (page - 1) * per_page, per_page)
         
         return users, total
 
     def update_user_role(self, db: Session, user_id: UUID, new_role: str, admin_id: UUID) -> User:
         """Update user role (admin only)."""
-        admin_user = self.get_user_by_id(db, admin_id)
-        if not admin_user.is_admin:
-            raise PermissionDeniedError("Only administrators can change user roles")
+        self._require_admin(db, admin_id, "Only administrators can change user roles")
         
         user = self.get_user_by_id(db, user_id)
         user.update_role(new_role)
         
         db.commit()
+        AuthorizationManager.invalidate(user.id)
         db.refresh(user)
         
         return user
 
     def activate_user(self, db: Session, user_id: UUID, admin_id: UUID) -> User:
         """Activate a user account (admin only)."""
-        admin_user = self.get_user_by_id(db, admin_id)
-        if not admin_user.is_admin:
-            raise PermissionDeniedError("Only administrators can activate user accounts")
+        self._require_admin(db, admin_id, "Only administrators can activate user accounts")
         
         user = self.get_user_by_id(db, user_id)
         user.is_active = True
         
         db.commit()
+        AuthorizationManager.invalidate(user.id)
         db.refresh(user)
         
         return user
 
     def deactivate_user(self, db: Session, user_id: UUID, admin_id: UUID) -> User:
         """Deactivate a user account (admin only)."""
-        admin_user = self.get_user_by_id(db, admin_id)
-        if not admin_user.is_admin:
-            raise PermissionDeniedError("Only administrators can deactivate user accounts")
+        self._require_admin(db, admin_id, "Only administrators can deactivate user accounts")
         
         user = self.get_user_by_id(db, user_id)
         user.is_active = False
         
         db.commit()
+        AuthorizationManager.invalidate(user.id)
         db.refresh(user)
         
         return user
 
     def grant_permission(self, db: Session, user_id: UUID, permission: str, admin_id: UUID) -> User:
         """Grant a specific permission to a user (admin only)."""
-        admin_user = self.get_user_by_id(db, admin_id)
-        if not admin_user.is_admin:
-            raise PermissionDeniedError("Only administrators can grant permissions")
+        self._require_admin(db, admin_id, "Only administrators can grant permissions")
         
         user = self.get_user_by_id(db, user_id)
         user.add_permission(permission)
         
         db.commit()
+        AuthorizationManager.invalidate(user.id)
         db.refresh(user)
         
         return user
 
     def revoke_permission(self, db: Session, user_id: UUID, permission: str, admin_id: UUID) -> User:
         """Revoke a specific permission from a user (admin only)."""
-        admin_user = self.get_user_by_id(db, admin_id)
-        if not admin_user.is_admin:
-            raise PermissionDeniedError("Only administrators can revoke permissions")
+        self._require_admin(db, admin_id, "Only administrators can revoke permissions")
         
         user = self.get_user_by_id(db, user_id)
         user.remove_permission(permission)
         
         db.commit()
+        AuthorizationManager.invalidate(user.id)
         db.refresh(user)
         
         return user
@@ -152,31 +185,27 @@ class UserService(BaseService[User]):
         
         # Users can only view their own stats, or admins can view anyone's
         if requesting_user_id:
-            requesting_user = self.get_user_by_id(db, requesting_user_id)
-            if not requesting_user.is_admin and requesting_user_id != user_id:
+            if requesting_user_id != user_id and not self._is_admin(db, requesting_user_id):
                 raise PermissionDeniedError("You can only view your own statistics")
         
         user = self.get_user_by_id(db, user_id)
         
         # Get song statistics
         from ..models.song import Song
-        song_stats = db.query(func.count(Song.id)).filter(Song.user_id == user_id).scalar()
-        public_songs = db.query(func.count(Song.id)).filter(
-            Song.user_id == user_id, Song.is_public == True
-        ).scalar()
-        flagged_songs = db.query(func.count(Song.id)).filter(
-            Song.user_id == user_id, Song.is_flagged == True
-        ).scalar()
-        
-        total_views = db.query(func.sum(Song.views)).filter(Song.user_id == user_id).scalar() or 0
+        song_stats = db.query(
+            func.count(Song.id).label("total"),
+            func.count(Song.id).filter(Song.is_public == True).label("public"),
+            func.count(Song.id).filter(Song.is_flagged == True).label("flagged"),
+            func.coalesce(func.sum(Song.views), 0).label("views"),
+        ).filter(Song.user_id == user_id).one()
         
         return {
             "user_id": str(user_id),
             "username": user.username,
-            "total_songs": song_stats,
-            "public_songs": public_songs,
-            "flagged_songs": flagged_songs,
-            "total_views": total_views,
+            "total_songs": song_stats.total,
+            "public_songs": song_stats.public,
+            "flagged_songs": song_stats.flagged,
+            "total_views": song_stats.views,
             "role": user.role,
             "is_active": user.is_active,
             "created_at": user.created_at.isoformat(),
@@ -185,28 +214,26 @@ class UserService(BaseService[User]):
 
     def promote_to_moderator(self, db: Session, user_id: UUID, admin_id: UUID) -> User:
         """Promote user to moderator (admin only)."""
-        admin_user = self.get_user_by_id(db, admin_id)
-        if not admin_user.is_admin:
-            raise PermissionDeniedError("Only administrators can promote users to moderator")
+        self._require_admin(db, admin_id, "Only administrators can promote users to moderator")
         
         user = self.get_user_by_id(db, user_id)
         user.update_role("moderator")
         
         db.commit()
+        AuthorizationManager.invalidate(user.id)
         db.refresh(user)
         
         return user
 
     def demote_from_moderator(self, db: Session, user_id: UUID, admin_id: UUID) -> User:
         """Demote moderator to regular user (admin only)."""
-        admin_user = self.get_user_by_id(db, admin_id)
-        if not admin_user.is_admin:
-            raise PermissionDeniedError("Only administrators can demote moderators")
+        self._require_admin(db, admin_id, "Only administrators can demote moderators")
         
         user = self.get_user_by_id(db, user_id)
         user.update_role("user")
         
         db.commit()
+        AuthorizationManager.invalidate(user.id)
         db.refresh(user)
         
         return user
@@ -1,58 +1,135 @@
 """Authorization decorators and utilities for GuitarTab Pro API."""
 
-from functools import wraps
-from typing import Callable, List, Optional, Union
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Union
 from uuid import UUID
 
-from flask import abort, jsonify, request
+from flask import abort, g, has_app_context, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import or_, true
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..database import get_request_db
 from ..models.user import User
 from ..models.song import Song
 from ..utils.exceptions import (
     AuthenticationError,
-    PermissionDeniedError,
     NotFoundError,
+    RateLimitError,
 )
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Authorization-relevant snapshot of the authenticated user."""
+    id: UUID
+    is_admin: bool
+    is_moderator: bool
+    role: str
+    permissions_set: FrozenSet[str]
+
+
+# (action, user ID, window index) -> (window end, request count); per process
+_RATE_LIMIT_MAX_KEYS = 10_000
+_rate_limit_counters: Dict[Tuple[str, str, int], Tuple[float, int]] = {}
+_rate_limit_lock = threading.Lock()
+
+
+def _current_uuid() -> UUID:
+    """Parse the JWT identity into a UUID once per request."""
+    if "_jwt_uuid" not in g:
+        g._jwt_uuid = UUID(get_jwt_identity())
+    return g._jwt_uuid
+
 
 class AuthorizationManager:
     """Centralized authorization management."""
     
     @staticmethod
-    def get_current_user(db: Session, user_id: UUID = None) -> Optional[User]:
-        """Get current user from database."""
+    def get_current_user(db: Session, user_id: UUID = None) -> CurrentUser:
+        """Get current user, loaded at most once per request."""
         if not user_id:
             user_id = get_jwt_identity()
             if not user_id:
                 raise AuthenticationError("Authentication required")
         
         try:
-            user_id = UUID(user_id)
+            user_id = UUID(str(user_id))
         except ValueError:
             raise AuthenticationError("Invalid user ID format")
         
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+        current_user = AuthorizationManager._cached_user(user_id)
+        if current_user is not None:
+            return current_user
+        
+        # Only the columns authorization needs; no full User hydration
+        row = (
+            db.query(User.id, User.is_admin, User.is_moderator, User.role, User.permissions)
+            .filter(User.id == user_id)
+            .first()
+        )
+        if not row:
             raise AuthenticationError("User not found")
         
-        return user
+        # Explicit permissions become a set once per snapshot, not scanned per check
+        current_user = CurrentUser(
+            row.id, row.is_admin, row.is_moderator, row.role,
+            frozenset((row.permissions or {}).get('explicit', ())),
+        )
+        if has_app_context():
+            g._current_user_id = user_id
+            g._current_user = current_user
+        return current_user
+    
+    @staticmethod
+    def _cached_user(user_id: UUID) -> Optional[CurrentUser]:
+        """
+        Return the user's snapshot if it was already loaded during this request.
+
+        Stacked decorators and handlers within one request share a single
+        lookup. Snapshots live on ``g`` only, so a role or permission change
+        takes effect on the user's next request in every worker.
+        """
+        if has_app_context() and g.get("_current_user_id") == user_id:
+            return g._current_user
+        return None
+    
+    @staticmethod
+    def is_admin(db: Session, user_id: UUID) -> bool:
+        """Check whether a user is an admin, selecting only users.is_admin on a cache miss."""
+        current_user = AuthorizationManager._cached_user(user_id)
+        if current_user is not None:
+            return current_user.is_admin
+        return bool(db.query(User.is_admin).filter(User.id == user_id).scalar())
+    
+    @staticmethod
+    def invalidate(user_id: UUID) -> None:
+        """Drop a user's snapshot from this request after a role or permission change."""
+        if has_app_context() and g.get("_current_user_id") == user_id:
+            g.pop("_current_user_id")
+            g.pop("_current_user")
     
     @staticmethod
     def check_owner_permission(
         db: Session, 
         resource_user_id: UUID, 
-        current_user_id: UUID
+        current_user_id: UUID,
+        current_user: Optional[CurrentUser] = None
     ) -> bool:
         """Check if current user is the owner of a resource."""
         if resource_user_id == current_user_id:
             return True
         
         # Check if current user is an admin
-        current_user = AuthorizationManager.get_current_user(db, current_user_id)
-        return getattr(current_user, 'is_admin', False)
+        if current_user is not None:
+            return current_user.is_admin
+        return AuthorizationManager.is_admin(db, current_user_id)
     
     @staticmethod
     def check_resource_access(
@@ -62,146 +139,140 @@ class AuthorizationManager:
         user_id: UUID,
         require_admin: bool = False
     ) -> bool:
-        """Check if user has access to a specific resource."""
-        user = AuthorizationManager.get_current_user(db, user_id)
+        """
+        Check if user has access to a specific resource.
+
+        When the user's snapshot is already loaded for this request, admins are authorized
+        without touching the resource table. Otherwise the owner-or-admin
+        decision is computed in SQL, so one row holds the answer: on a cache
+        miss it comes from a single resource LEFT JOIN users query.
+        """
+        owner_column = getattr(resource_model, 'user_id', None)
+        is_owner = owner_column == user_id if owner_column is not None else true()
         
-        if require_admin and not getattr(user, 'is_admin', False):
-            return False
+        current_user = AuthorizationManager._cached_user(user_id)
+        if current_user is not None:
+            if current_user.is_admin:
+                return True
+            if require_admin:
+                return False
+            
+            row = db.query(is_owner).filter(resource_model.id == resource_id).first()
+            if row is None:
+                raise NotFoundError(f"Resource with ID {resource_id} not found")
+            return bool(row[0])
         
-        # Get the resource
-        resource = db.query(resource_model).filter(resource_model.id == resource_id).first()
-        if not resource:
+        row = (
+            db.query(User.is_admin, or_(is_owner, User.is_admin))
+            .select_from(resource_model)
+            .outerjoin(User, User.id == user_id)
+            .filter(resource_model.id == resource_id)
+            .first()
+        )
+        if row is None:
             raise NotFoundError(f"Resource with ID {resource_id} not found")
         
-        # Check ownership if not admin
-        if hasattr(resource, 'user_id'):
-            if not AuthorizationManager.check_owner_permission(
-                db, resource.user_id, user_id
-            ):
-                return False
+        is_admin, allowed = row
+        if is_admin is None:
+            raise AuthenticationError("User not found")
         
-        return True
+        if require_admin:
+            return bool(is_admin)
+        return bool(allowed)
 
 
-def require_auth(f: Callable) -> Callable:
-    """Decorator to require authentication."""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
+def authorize(
+    owner_of=None,
+    id_param: Union[str, Tuple[str, ...]] = 'song_id',
+    require_admin: bool = False,
+    permission: Optional[str] = None,
+    roles: Optional[Union[str, List[str]]] = None,
+    log: bool = False,
+):
+    """
+    Decorator factory performing every authorization check in a single pass.
+
+    One JWT verification, one identity parse, one session and at most one user
+    lookup cover authentication, admin, role, permission and ownership checks,
+    so an endpoint needs only this decorator instead of a stack of them.
+    """
+    if isinstance(roles, str):
+        roles = [roles]
+    roles_set = frozenset(roles) if roles is not None else None
+    roles_str = ", ".join(roles) if roles is not None else ""
+    id_params = (id_param,) if isinstance(id_param, str) else tuple(id_param)
+    
+    def decorator(f: Callable) -> Callable:
+        @wraps(f)
         @jwt_required()
-        def auth_check():
-            user_id = get_jwt_identity()
-            if not user_id:
-                abort(401, "Authentication required")
+        def decorated_function(*args, **kwargs):
+            try:
+                current_user_id = _current_uuid()
+            except (TypeError, ValueError):
+                abort(401, "Invalid authentication")
+            db = get_request_db()
             
             # Validate user exists
-            db = get_db()
             try:
-                AuthorizationManager.get_current_user(db, UUID(user_id))
-            except (ValueError, AuthenticationError):
+                user = AuthorizationManager.get_current_user(db, current_user_id)
+            except AuthenticationError:
                 abort(401, "Invalid authentication")
             
-            return f(*args, **kwargs)
-        
-        return auth_check()
-    return decorated_function
-
-
-def require_owner(f: Callable) -> Callable:
-    """Decorator to require ownership of a resource."""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        @jwt_required()
-        def owner_check():
-            current_user_id = UUID(get_jwt_identity())
-            db = get_db()
+            if require_admin and not user.is_admin:
+                abort(403, "Admin privileges required")
             
-            # Get resource ID from kwargs or request
-            resource_id = kwargs.get('song_id') or kwargs.get('resource_id')
-            if not resource_id:
-                abort(400, "Resource ID required")
+            # Check if user has any of the required roles
+            if roles_set is not None and user.role not in roles_set:
+                abort(403, f"One of the following roles required: {roles_str}")
             
-            resource_id = UUID(resource_id)
+            # Check specific permission
+            if permission is not None and permission not in user.permissions_set:
+                abort(403, f"Permission '{permission}' required")
             
-            # Check ownership
-            if not AuthorizationManager.check_resource_access(
-                db, resource_id, Song, current_user_id
-            ):
-                abort(403, "Access denied: ownership required")
+            # Check ownership of the addressed resource
+            if owner_of is not None:
+                resource_id = next(
+                    (kwargs[name] for name in id_params if kwargs.get(name)), None
+                )
+                if not resource_id:
+                    abort(400, f"{id_params[0]} parameter required")
+                
+                if not AuthorizationManager.check_resource_access(
+                    db, UUID(str(resource_id)), owner_of, current_user_id
+                ):
+                    abort(403, "Access denied: ownership required")
+            
+            if log and logger.isEnabledFor(logging.INFO):
+                logger.info("Authorization: User %s accessing %s", current_user_id, f.__name__)
             
             return f(*args, **kwargs)
-        
-        return owner_check()
-    return decorated_function
+        return decorated_function
+    return decorator
+
+
+def require_auth(f: Callable) -> Callable:
+    """Decorator to require authentication."""
+    return authorize()(f)
+
+
+def require_owner(f: Callable) -> Callable:
+    """Decorator to require ownership of a resource."""
+    return authorize(owner_of=Song, id_param=('song_id', 'resource_id'))(f)
 
 
 def require_admin(f: Callable) -> Callable:
     """Decorator to require admin privileges."""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        @jwt_required()
-        def admin_check():
-            current_user_id = UUID(get_jwt_identity())
-            db = get_db()
-            
-            user = AuthorizationManager.get_current_user(db, current_user_id)
-            if not getattr(user, 'is_admin', False):
-                abort(403, "Admin privileges required")
-            
-            return f(*args, **kwargs)
-        
-        return admin_check()
-    return decorated_function
+    return authorize(require_admin=True)(f)
 
 
 def require_permission(permission: str):
     """Decorator factory for specific permissions."""
-    def decorator(f: Callable) -> Callable:
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            @jwt_required()
-            def permission_check():
-                current_user_id = UUID(get_jwt_identity())
-                db = get_db()
-                
-                user = AuthorizationManager.get_current_user(db, current_user_id)
-                
-                # Check specific permission
-                user_permissions = getattr(user, 'permissions', [])
-                if permission not in user_permissions:
-                    abort(403, f"Permission '{permission}' required")
-                
-                return f(*args, **kwargs)
-            
-            return permission_check()
-        return decorated_function
-    return decorator
+    return authorize(permission=permission)
 
 
 def require_role(roles: Union[str, List[str]]):
     """Decorator factory for role-based access."""
-    if isinstance(roles, str):
-        roles = [roles]
-    
-    def decorator(f: Callable) -> Callable:
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            @jwt_required()
-            def role_check():
-                current_user_id = UUID(get_jwt_identity())
-                db = get_db()
-                
-                user = AuthorizationManager.get_current_user(db, current_user_id)
-                
-                # Check if user has any of the required roles
-                user_role = getattr(user, 'role', 'user')
-                if user_role not in roles:
-                    abort(403, f"One of the following roles required: {', '.join(roles)}")
-                
-                return f(*args, **kwargs)
-            
-            return role_check()
-        return decorated_function
-    return decorator
+    return authorize(roles=roles)
 
 
 class ResourceProtector:
@@ -211,40 +282,69 @@ class ResourceProtector:
         self.resource_model = resource_model
         self.id_param_name = id_param_name
     
+    @lru_cache(maxsize=None)
     def protect(self, require_owner: bool = True, require_admin: bool = False):
-        """Create a resource protection decorator."""
+        """Create a resource protection decorator, built once per argument combination."""
+        if require_admin:
+            return authorize(require_admin=True)
+        if require_owner:
+            return authorize(owner_of=self.resource_model, id_param=self.id_param_name)
+        return authorize()
+    
+    @lru_cache(maxsize=None)
+    def protect_bulk(self, id_param: str = 'ids'):
+        """
+        Create a decorator requiring ownership (or admin) of every resource in a batch.
+
+        IDs come from a comma-separated query parameter or a JSON body list and
+        are checked with one IN query; looping protect() over them would issue a
+        query per resource (N+1).
+        """
         def decorator(f: Callable) -> Callable:
             @wraps(f)
+            @jwt_required()
             def decorated_function(*args, **kwargs):
-                @jwt_required()
-                def protection_check():
-                    # Get current user
-                    current_user_id = UUID(get_jwt_identity())
-                    
-                    # Get resource ID
-                    resource_id = kwargs.get(self.id_param_name)
-                    if not resource_id:
-                        abort(400, f"{self.id_param_name} parameter required")
-                    
-                    resource_id = UUID(str(resource_id))
-                    db = get_db()
-                    
-                    # Check admin requirement first
-                    if require_admin:
-                        user = AuthorizationManager.get_current_user(db, current_user_id)
-                        if not getattr(user, 'is_admin', False):
-                            abort(403, "Admin privileges required")
-                    
-                    # Check ownership if required
-                    elif require_owner:
-                        if not AuthorizationManager.check_resource_access(
-                            db, resource_id, self.resource_model, current_user_id
-                        ):
-                            abort(403, "Access denied: ownership required")
-                    
-                    return f(*args, **kwargs)
+                current_user_id = _current_uuid()
+                
+                # Get resource IDs
+                raw_ids = request.args.get(id_param)
+                if raw_ids is not None:
+                    raw_ids = [value for value in raw_ids.split(',') if value]
+                else:
+                    raw_ids = (request.get_json(silent=True) or {}).get(id_param)
+                if not raw_ids:
+                    abort(400, f"{id_param} parameter required")
+                try:
+                    resource_ids = {UUID(str(value)) for value in raw_ids}
+                except ValueError:
+                    abort(400, f"Invalid {id_param} parameter")
+                
+                db = get_request_db()
+                try:
+                    user = AuthorizationManager.get_current_user(db, current_user_id)
+                except AuthenticationError:
+                    abort(401, "Invalid authentication")
+                
+                owner_column = getattr(self.resource_model, 'user_id', None)
+                rows = (
+                    db.query(
+                        self.resource_model.id,
+                        owner_column if owner_column is not None else self.resource_model.id,
+                    )
+                    .filter(self.resource_model.id.in_(resource_ids))
+                    .all()
+                )
+                
+                missing = resource_ids.difference(resource_id for resource_id, _ in rows)
+                if missing:
+                    abort(404, f"Resources not found: {', '.join(sorted(map(str, missing)))}")
+                
+                if owner_column is not None and not user.is_admin:
+                    forbidden = sorted(str(rid) for rid, owner in rows if owner != current_user_id)
+                    if forbidden:
+                        abort(403, f"Access denied: ownership required for {', '.join(forbidden)}")
                 
-                return protection_check()
+                return f(*args, **kwargs)
             return decorated_function
         return decorator
     
@@ -266,40 +366,49 @@ SongProtector = ResourceProtector(Song, 'song_id')
 
 
 def rate_limit(action: str, max_requests: int, window_minutes: int = 1):
-    """Simple rate limiting decorator."""
-    # In a real implementation, you'd use Redis or similar
-    import time
+    """
+    Fixed-window rate limiting decorator, counted per user and action.
+
+    Counters live in process memory and are not shared: each worker enforces
+    the limit independently, so a user can make up to max_requests times the
+    number of workers per window. At most _RATE_LIMIT_MAX_KEYS counters are
+    kept per worker; when full, expired windows go first, then the oldest
+    counters, which resets those users' counts early. The check runs only
+    after the JWT has been verified.
+    """
+    window_seconds = window_minutes * 60
     
     def decorator(f: Callable) -> Callable:
         @wraps(f)
+        @jwt_required()
         def decorated_function(*args, **kwargs):
-            @jwt_required()
-            def rate_check():
-                current_user_id = get_jwt_identity()
-                # For demo purposes, we'll just log the rate limit check
-                # In production, implement proper rate limiting with Redis
-                return f(*args, **kwargs)
+            now = time.time()
+            window = int(now // window_seconds)
+            key = (action, get_jwt_identity(), window)
+            
+            with _rate_limit_lock:
+                if len(_rate_limit_counters) >= _RATE_LIMIT_MAX_KEYS:
+                    expired = [k for k, (end, _) in _rate_limit_counters.items() if end <= now]
+                    for stale in expired:
+                        del _rate_limit_counters[stale]
+                    # Still full of live windows: drop the oldest (dicts keep insertion order)
+                    while len(_rate_limit_counters) >= _RATE_LIMIT_MAX_KEYS:
+                        del _rate_limit_counters[next(iter(_rate_limit_counters))]
+                expires, count = _rate_limit_counters.get(key, ((window + 1) * window_seconds, 0))
+                count += 1
+                _rate_limit_counters[key] = (expires, count)
+            
+            if count > max_requests:
+                raise RateLimitError(
+                    f"Rate limit exceeded for {action}: "
+                    f"{max_requests} requests per {window_minutes} minute(s)"
+                )
             
-            return rate_check()
+            return f(*args, **kwargs)
         return decorated_function
     return decorator
 
 
 def request_logging(f: Callable) -> Callable:
     """Decorator to log authorization requests for audit."""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        @jwt_required(refresh=False)
-        def log_check():
-            current_user_id = get_jwt_identity()
-            
-            # Log the authorization event
-            logger.info(f"Authorization: User {current_user_id} accessing {f.__name__}")
-            
-            return f(*args, **kwargs)
-        
-        return log_check()
-    return decorated_function
+    return authorize(log=True)(f)
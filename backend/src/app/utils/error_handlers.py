@@ -1,98 +1,214 @@
 """Global error handlers for the Flask application."""
 
-from flask import Flask, jsonify, request
+import hashlib
+from functools import lru_cache, wraps
+from typing import Callable, Optional
+
+import orjson
+from flask import Flask, Response, current_app, request
 from werkzeug.exceptions import HTTPException
 from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from marshmallow import ValidationError as MarshmallowValidationError
 
-from .exceptions import APIException
+from .exceptions import (
+    APIException,
+    ConflictError,
+    ValidationError,
+)
+from .responses import ErrorResponse
 
+# Fixed Problem Details fields, built once rather than on every error
+_VALIDATION_ERROR_BODY = {
+    "status": 422,
+    "title": "Validation Error",
+    "detail": "Input validation failed",
+    "code": "validation_error",
+    "type": "about:blank?type=422",
+}
+_INTERNAL_ERROR_JSON = orjson.dumps({
+    "status": 500,
+    "title": "Internal Server Error",
+    "detail": "An unexpected error occurred.",
+    "type": "about:blank?type=500",
+})
 
-def register_error_handlers(app: Flask):
-    """Register common error handlers for the Flask application."""
 
-    @app.errorhandler(APIException)
-    def handle_api_exception(e):
-        """Handle custom API exceptions."""
-        response = jsonify({
-            "status": e.status_code,
-            "title": e.__class__.__name__,
-            "detail": e.detail,
-            "code": e.code,
-            "type": f"about:blank?type={e.status_code}",
-        })
-        response.status_code = e.status_code
-        return response
+def handle_errors(failure_message: str) -> Callable:
+    """
+    Decorator factory that turns exceptions raised by a route into error responses.
 
-    @app.errorhandler(PydanticValidationError)
-    def handle_pydantic_validation_error(e):
-        """Handle Pydantic validation errors."""
-        response = jsonify({
-            "status": 422,
-            "title": "Validation Error",
-            "detail": "Input validation failed",
-            "code": "validation_error",
-            "type": "about:blank?type=422",
-            "errors": e.errors(),
-            "body": e.model._get_model_dump() if hasattr(e, 'model') else None,
-        })
-        response.status_code = 422
-        return response
+    Every response has the route-level ErrorResponse.from_exception shape
+    ({"message", "code", "errors"}). API exceptions keep their status and
+    code; pydantic and marshmallow validation errors, database errors and
+    HTTP exceptions are first converted to the matching API exception. Only
+    unknown errors become a 500 prefixed with ``failure_message``.
+
+    Responses are built here rather than by re-raising, because flask-restx
+    answers exceptions from its resources with its own 500 before the
+    app-level handlers are consulted.
+    """
+    def decorator(f: Callable) -> Callable:
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                return f(*args, **kwargs)
+            except Exception as e:
+                convert = _api_exception_converter(type(e))
+                if convert is not None:
+                    return ErrorResponse.from_exception(convert(e))
+                current_app.logger.error("%s: %s", failure_message, e, exc_info=True)
+                return ErrorResponse.from_exception(APIException(f"{failure_message}: {e}"))
+        return decorated_function
+    return decorator
+
+
+def _json_response(body: dict, status: int) -> Response:
+    """Encode a Problem Details body with orjson, bypassing jsonify."""
+    return Response(orjson.dumps(body, default=str), status=status, mimetype="application/json")
+
+
+def _handle_api_exception(e: APIException) -> Response:
+    """Handle custom API exceptions."""
+    return _json_response({
+        "status": e.status_code,
+        "title": e.__class__.__name__,
+        "detail": e.detail,
+        "code": e.code,
+        "type": f"about:blank?type={e.status_code}",
+        "errors": e.errors,
+    }, e.status_code)
+
+
+def _handle_pydantic_validation_error(e: PydanticValidationError) -> Response:
+    """Handle Pydantic validation errors."""
+    return _json_response({
+        **_VALIDATION_ERROR_BODY,
+        "errors": e.errors(),
+        "body": e.model._get_model_dump() if hasattr(e, 'model') else None,
+    }, 422)
+
+
+def _handle_marshmallow_validation_error(e: MarshmallowValidationError) -> Response:
+    """Handle Marshmallow validation errors."""
+    return _json_response({**_VALIDATION_ERROR_BODY, "errors": e.messages}, 422)
+
+
+def _handle_integrity_error(e: IntegrityError) -> Response:
+    """Handle database constraint violations, e.g. duplicate unique values."""
+    return _handle_api_exception(_integrity_to_api_exception(e))
+
+
+def _handle_sqlalchemy_error(e: SQLAlchemyError) -> Response:
+    """Handle database errors not covered by a more specific handler."""
+    return _handle_api_exception(_database_to_api_exception(e))
 
-    @app.errorhandler(MarshmallowValidationError)
-    def handle_marshmallow_validation_error(e):
-        """Handle Marshmallow validation errors."""
-        response = jsonify({
-            "status": 422,
-            "title": "Validation Error", 
-            "detail": "Input validation failed",
-            "code": "validation_error",
-            "type": "about:blank?type=422",
-            "errors": e.messages,
-        })
-        response.status_code = 422
-        return response
 
-    @app.errorhandler(HTTPException)
-    def handle_http_exception(e):
-        """Handle HTTP exceptions (e.g., 404, 500)."""
-        response = e.get_response()
-        if response is not None:
-            # If the exception already has a response, use it
-            return response
-
-        # For other HTTP exceptions, create a JSON response
-        response = jsonify(
-            {
-                "status": e.code,
-                "title": e.name,
-                "detail": e.description,
-                "type": f"about:blank?type={e.code}",
-            }
-        )
-        response.status_code = e.code
+def _handle_http_exception(e: HTTPException) -> Response:
+    """Handle HTTP exceptions (e.g., 404, 500)."""
+    response = e.get_response()
+    if response is not None:
+        # If the exception already has a response, use it
         return response
 
-    @app.errorhandler(Exception)
-    def handle_generic_exception(e):
-        """Handle generic exceptions (e.g., unhandled errors)."""
-        app.logger.error(f"An unhandled exception occurred: {e}", exc_info=True)
-        
-        # Log additional context for debugging
-        if request:
-            app.logger.error(f"Request URL: {request.url}")
-            app.logger.error(f"Request Method: {request.method}")
-            app.logger.error(f"Request Headers: {dict(request.headers)}")
-            if request.is_json:
-                app.logger.error(f"Request JSON: {request.get_json()}")
-        
-        response = jsonify(
-            {
-                "status": 500,
-                "title": "Internal Server Error",
-                "detail": "An unexpected error occurred.",
-                "type": "about:blank?type=500",
-            }
-        )
-        response.status_code = 500
-        return response
\ No newline at end of file
+    # For other HTTP exceptions, create a JSON response
+    return _json_response(
+        {
+            "status": e.code,
+            "title": e.name,
+            "detail": e.description,
+            "type": f"about:blank?type={e.code}",
+        },
+        e.code,
+    )
+
+
+def _handle_generic_exception(e: Exception) -> Response:
+    """
+    Handle generic exceptions (e.g., unhandled errors).
+
+    Headers and the JSON body are logged only in debug mode or when
+    LOG_REQUEST_BODY_ON_ERROR is set; otherwise a digest identifies the body.
+    """
+    logger = current_app.logger
+    logger.error("An unhandled exception occurred: %s", e, exc_info=True)
+    
+    # Log additional context for debugging
+    if request:
+        if current_app.debug or current_app.config.get("LOG_REQUEST_BODY_ON_ERROR"):
+            logger.error(
+                "Request %s %s headers=%s json=%s",
+                request.method,
+                request.url,
+                dict(request.headers),
+                request.get_json(silent=True) if request.is_json else None,
+            )
+        else:
+            logger.error(
+                "Request %s %s body_digest=%s",
+                request.method,
+                request.url,
+                hashlib.blake2b(request.get_data(), digest_size=8).hexdigest(),
+            )
+    
+    return Response(_INTERNAL_ERROR_JSON, status=500, mimetype="application/json")
+
+
+# Flask resolves each raised exception to the handler of its nearest registered base class
+_ERROR_HANDLERS = {
+    APIException: _handle_api_exception,
+    PydanticValidationError: _handle_pydantic_validation_error,
+    MarshmallowValidationError: _handle_marshmallow_validation_error,
+    IntegrityError: _handle_integrity_error,
+    SQLAlchemyError: _handle_sqlalchemy_error,
+    HTTPException: _handle_http_exception,
+    Exception: _handle_generic_exception,
+}
+
+
+def _integrity_to_api_exception(e: IntegrityError) -> APIException:
+    """Log a constraint violation and report it as a conflict."""
+    current_app.logger.warning(f"Integrity error: {e.orig}")
+    return ConflictError()
+
+
+def _database_to_api_exception(e: SQLAlchemyError) -> APIException:
+    """Log a database error and report it without its SQL."""
+    current_app.logger.error(f"A database error occurred: {e}", exc_info=True)
+    return APIException("A database error occurred.", code="database_error")
+
+
+def _http_to_api_exception(e: HTTPException) -> APIException:
+    """Carry an HTTP exception's status and description over to an API exception."""
+    return APIException(e.description, status_code=e.code, code=e.name.lower().replace(" ", "_"))
+
+
+# How handle_errors turns each known exception type into an API exception
+_API_EXCEPTION_CONVERTERS = {
+    APIException: lambda e: e,
+    PydanticValidationError: lambda e: ValidationError(
+        "Input validation failed", errors=e.errors()
+    ),
+    MarshmallowValidationError: lambda e: ValidationError(
+        "Input validation failed", errors=e.messages
+    ),
+    IntegrityError: _integrity_to_api_exception,
+    SQLAlchemyError: _database_to_api_exception,
+    HTTPException: _http_to_api_exception,
+}
+
+
+@lru_cache(maxsize=None)
+def _api_exception_converter(exc_type: type) -> Optional[Callable]:
+    """Return the _API_EXCEPTION_CONVERTERS entry for the nearest base class, if any."""
+    for cls in exc_type.__mro__:
+        convert = _API_EXCEPTION_CONVERTERS.get(cls)
+        if convert is not None:
+            return convert
+    return None
+
+
+def register_error_handlers(app: Flask):
+    """Register common error handlers for the Flask application."""
+    for exc_type, handler in _ERROR_HANDLERS.items():
+        app.register_error_handler(exc_type, handler)
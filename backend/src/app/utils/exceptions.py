@@ -14,6 +14,12 @@ class APIException(Exception):
     status_code: int = 500
     default_detail: str = "A server error occurred."
     default_code: str = "server_error"
+    # Class-constant part of to_dict(); subclasses get theirs from __init_subclass__
+    _base_dict: Dict[str, Any] = {
+        "code": default_code,
+        "status": status_code,
+        "title": "APIException",
+    }
 
     def __init__(
         self, 
@@ -28,14 +34,26 @@ class APIException(Exception):
         self.errors = errors
         super().__init__(self.detail)
 
+    def __init_subclass__(cls, **kwargs):
+        """Pre-build the class-constant part of to_dict() once per exception class."""
+        super().__init_subclass__(**kwargs)
+        cls._base_dict = {
+            "code": cls.default_code,
+            "status": cls.status_code,
+            "title": cls.__name__,
+        }
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to dictionary for JSON response."""
-        result = {
-            "detail": self.detail, 
-            "code": self.code,
-            "status": self.status_code,
-            "title": self.__class__.__name__
-        }
+        if self.code == self.default_code and self.status_code == type(self).status_code:
+            result = {"detail": self.detail, **self._base_dict}
+        else:
+            result = {
+                "detail": self.detail, 
+                "code": self.code,
+                "status": self.status_code,
+                "title": self.__class__.__name__
+            }
         if self.errors:
             result["errors"] = self.errors
         return result
@@ -51,12 +69,63 @@ class ValidationError(APIException):
     status_code = 422
     default_detail = "Invalid input data."
     default_code = "validation_error"
+    # Detail templates selected by ``reason``; formatted only when the detail is read
+    _TEMPLATES: Dict[str, str] = {
+        "required": "{field} is required",
+        "invalid_format": "Invalid {field} format",
+        "expected_string": "Invalid {field} format: expected string",
+        "invalid_uuid": "Invalid {field} format: must be a valid UUID",
+        "expected_uuid": "Invalid {field} format: expected string or UUID",
+        "missing_protocol": "Invalid {field} format: must include protocol (http/https)",
+        "unsupported_protocol": "Invalid {field} format: only HTTP and HTTPS protocols are allowed",
+    }
+    _template: Optional[str] = None
 
-    def __init__(self, detail: str = None, errors: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        detail: str = None,
+        errors: Optional[Dict[str, Any]] = None,
+        reason: Optional[str] = None,
+        **context: Any
+    ):
         super().__init__(detail=detail, errors=errors)
         # Use 400 for simple validation errors, 422 for detailed validation failures
         if errors:
             self.status_code = 422
+        if detail is None and reason is not None:
+            self._template = self._TEMPLATES[reason]
+            self._context = context
+
+    @property
+    def detail(self) -> str:
+        """The error message, formatted from its template on first access."""
+        if self._template is not None:
+            self._detail = self._template.format(**self._context)
+            self._template = None
+        return self._detail
+
+    @detail.setter
+    def detail(self, value: str) -> None:
+        self._detail = value
+
+    @property
+    def args(self) -> tuple:
+        """Exception arguments, kept in step with the lazily formatted detail."""
+        return (self.detail,)
+
+    @args.setter
+    def args(self, value: tuple) -> None:
+        BaseException.args.__set__(self, value)
+
+    def __str__(self) -> str:
+        return self.detail
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.detail!r})"
+
+    def __reduce__(self):
+        # Pickle the formatted message rather than the template state
+        return type(self), (self.detail, self.errors)
 
 
 class NotFoundError(APIException):
@@ -1,33 +1,140 @@
 """Advanced pagination utilities for the GuitarTab Pro API."""
 
-from typing import Any, Dict, List, Optional, Tuple, Generic, TypeVar
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Generic, TypeVar
 from dataclasses import dataclass
-from sqlalchemy import func
-from sqlalchemy.orm import Session, Query
-from sqlalchemy.sql import Select
+from functools import lru_cache
+from flask import current_app, has_app_context
+from sqlalchemy import Column, func, inspect, tuple_
+from sqlalchemy.orm import Session, Query, selectinload
+from sqlalchemy.sql import Select, operators
 
 T = TypeVar('T')
 
+# Offsets past which offset_based_paginate seeks by keyset instead of OFFSET
+KEYSET_THRESHOLD = 1000
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class PaginationInfo:
     """Information about pagination state."""
     page: int
     per_page: int
-    total: int
-    pages: int
+    total: Optional[int]
+    pages: Optional[int]
     has_next: bool
     has_prev: bool
     next_page: Optional[int]
     prev_page: Optional[int]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PaginatedResult(Generic[T]):
     """Result container for paginated data."""
     items: List[T]
     pagination: PaginationInfo
-    total: int
+    total: Optional[int]
+
+
+def _to_int(value: Optional[str], default: int) -> int:
+    """Parse an integer query argument, falling back to the default if absent or invalid."""
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def parse_pagination_args(
+    args: Mapping[str, str],
+    default_per_page: int = 20,
+    max_per_page: int = 100
+) -> Tuple[int, int]:
+    """
+    Read page and per_page from request arguments in one pass.
+    
+    Invalid values fall back to the defaults instead of raising, and both are
+    clamped: page to at least 1, per_page to 1..max_per_page.
+    """
+    page = _to_int(args.get('page'), 1)
+    per_page = _to_int(args.get('per_page'), default_per_page)
+    return max(1, page), min(max(1, per_page), max_per_page)
+
+
+def fast_count(query: Query) -> int:
+    """
+    Count a query's rows without wrapping it in an ordered subquery.
+    
+    Query.count() runs SELECT count(*) FROM (<query>), ORDER BY included, so
+    the database still sorts rows it only needs to count. Unless GROUP BY or
+    DISTINCT changes what a row is, the count replaces the select list of the
+    statement directly and the ordering is dropped.
+    """
+    statement = query.statement
+    if statement._group_by_clauses or statement._distinct:
+        return query.order_by(None).count()
+    
+    count_statement = statement.with_only_columns(
+        func.count(), maintain_column_froms=True
+    ).order_by(None)
+    return query.session.execute(count_statement).scalar()
+
+
+def fetch_page_with_total(query: Query, offset: int, limit: int) -> Tuple[List[Any], int]:
+    """
+    Fetch one page of a query along with the unpaginated row count.
+    
+    The total comes back as a COUNT(*) OVER() column on the page rows, so
+    the filters run once instead of once for COUNT and again for the page.
+    An empty page past the first falls back to a separate COUNT, since there
+    is no row to carry the total.
+    
+    Args:
+        query: SQLAlchemy query selecting a single entity
+        offset: Number of rows to skip
+        limit: Maximum number of rows to return
+        
+    Returns:
+        Tuple of (items, total)
+    """
+    rows = query.add_columns(func.count().over().label("_total")).offset(offset).limit(limit).all()
+    if rows:
+        return [row[0] for row in rows], rows[0]._total
+    return [], fast_count(query) if offset else 0
+
+
+def _keyset_order(query: Query) -> Optional[Tuple[List[Column], bool]]:
+    """
+    Return a query's ORDER BY columns and direction if cursor_based_paginate can serve it.
+    
+    That is a unique column alone, or a sort column followed by a unique
+    tiebreaker (e.g. the primary key), both NOT NULL and in one direction.
+    """
+    columns = []
+    directions = set()
+    for clause in query._order_by_clauses:
+        modifier = getattr(clause, 'modifier', None)
+        column = clause.element if modifier in (operators.desc_op, operators.asc_op) else clause
+        if not isinstance(column, Column) or column.nullable:
+            return None
+        columns.append(column)
+        directions.add(modifier is operators.desc_op)
+    
+    if not 0 < len(columns) <= 2 or len(directions) != 1:
+        return None
+    if not (columns[-1].primary_key or columns[-1].unique):
+        return None
+    return columns, directions.pop()
+
+
+@lru_cache(maxsize=None)
+def _entity_columns(entity: Any) -> Dict[str, Any]:
+    """Map an entity's column attribute names to its attributes, built once per entity."""
+    return {attr.key: getattr(entity, attr.key) for attr in inspect(entity).column_attrs}
 
 
 class AdvancedPagination:
@@ -38,16 +145,32 @@ class AdvancedPagination:
         query: Query,
         page: int = 1,
         per_page: int = 20,
-        max_per_page: int = 100
+        max_per_page: int = 100,
+        keyset_threshold: int = KEYSET_THRESHOLD,
+        total: Optional[int] = None,
+        count: bool = True,
+        eager: Optional[Sequence[Any]] = None
     ) -> Tuple[List[Any], PaginationInfo]:
         """
         Perform offset-based pagination.
         
+        Past keyset_threshold rows, a query ordered by a NOT NULL column and a
+        unique tiebreaker is handed to cursor_based_paginate: the previous
+        row's sort keys are read with a key-only query and the page is fetched
+        by seeking past them, so full rows are never read just to be skipped.
+        
         Args:
             query: SQLAlchemy query object
             page: Current page number (1-based)
             per_page: Number of items per page
             max_per_page: Maximum allowed items per page
+            keyset_threshold: Offset past which keyset pagination is used
+            total: Row count already known to the caller; skips counting
+            count: Whether to count rows at all; if False, one extra row is
+                fetched to derive has_next, and total/pages are None unless
+                the page turns out to be the last one
+            eager: Relationship attributes to load for the page's rows with one
+                SELECT ... WHERE id IN (...) each, instead of one query per row
             
         Returns:
             Tuple of (items, pagination_info)
@@ -57,8 +180,41 @@ class AdvancedPagination:
         per_page = max(1, per_page)
         page = max(1, page)
 
-        # Get total count
-        total = query.count()
+        offset = (page - 1) * per_page
+        if eager:
+            query = query.options(*(selectinload(relationship) for relationship in eager))
+        
+        if not count and total is None:
+            # Probe one row past the page instead of counting
+            items = query.offset(offset).limit(per_page + 1).all()
+            has_next = len(items) > per_page
+            
+            # A short, non-empty (or first) page is the last one, so its total is exact
+            total = None
+            if not has_next and (items or offset == 0):
+                total = offset + len(items)
+            return items[:per_page], PaginationInfo(
+                page=page,
+                per_page=per_page,
+                total=total,
+                pages=(total + per_page - 1) // per_page if total is not None else None,
+                has_next=has_next,
+                has_prev=page > 1,
+                next_page=page + 1 if has_next else None,
+                prev_page=page - 1 if page > 1 else None
+            )
+
+        # Get items for current page together with the total count
+        order = _keyset_order(query) if offset > keyset_threshold else None
+        if order is not None:
+            items = AdvancedPagination._keyset_page(query, order, offset, per_page)
+            if total is None:
+                total = fast_count(query)
+        elif total is not None:
+            # The caller already knows the total, so fetch the page alone
+            items = query.offset(offset).limit(per_page).all()
+        else:
+            items, total = fetch_page_with_total(query, offset, per_page)
 
         # Calculate pagination info
         pages = (total + per_page - 1) // per_page
@@ -78,47 +234,79 @@ class AdvancedPagination:
             prev_page=prev_page
         )
 
-        # Get items for current page
-        offset = (page - 1) * per_page
-        items = query.offset(offset).limit(per_page).all()
-
         return items, pagination_info
 
+    @staticmethod
+    def _keyset_page(
+        query: Query, order: Tuple[List[Column], bool], offset: int, per_page: int
+    ) -> List[Any]:
+        """Fetch the page at offset via cursor_based_paginate, starting after row offset - 1."""
+        columns, descending = order
+        cursor = query.with_entities(*columns).offset(offset - 1).limit(1).first()
+        if cursor is None:
+            return []
+        
+        items, _ = AdvancedPagination.cursor_based_paginate(
+            query.order_by(None),
+            cursor_field=columns[0].key,
+            cursor_value=tuple(cursor) if len(columns) > 1 else cursor[0],
+            limit=per_page,
+            reverse=descending,
+            tiebreaker_field=columns[-1].key
+        )
+        return items
+
     @staticmethod
     def cursor_based_paginate(
         query: Query,
         cursor_field: str,
         cursor_value: Optional[Any] = None,
         limit: int = 20,
-        reverse: bool = False
+        reverse: bool = False,
+        tiebreaker_field: Optional[str] = 'id'
     ) -> Tuple[List[Any], Dict[str, Any]]:
         """
         Perform cursor-based pagination for better performance with large datasets.
         
+        Rows are ordered by (cursor_field, tiebreaker_field) and the cursor is
+        that pair from the last row, compared as a row value, so duplicate
+        cursor_field values (e.g. equal timestamps) are never skipped or
+        repeated across pages.
+        
         Args:
             query: SQLAlchemy query object
             cursor_field: Field to use for cursor pagination (e.g., 'created_at')
-            cursor_value: Current cursor value
+            cursor_value: Current cursor, a (cursor_field, tiebreaker_field) pair;
+                a bare cursor_field value compares on that column alone
             limit: Number of items to retrieve
             reverse: Whether to paginate backwards
+            tiebreaker_field: Unique field breaking ties, or None to order by
+                cursor_field alone
             
         Returns:
             Tuple of (items, cursor_info)
         """
+        columns = _entity_columns(query.column_descriptions[0]['entity'])
+        order_columns = [columns[cursor_field]]
+        if tiebreaker_field is not None and tiebreaker_field != cursor_field:
+            order_columns.append(columns[tiebreaker_field])
+
         # Apply cursor filter
         if cursor_value:
-            cursor_column = getattr(query.column_descriptions[0]['entity'], cursor_field)
+            if isinstance(cursor_value, (tuple, list)) and len(order_columns) > 1:
+                keys, values = tuple_(*order_columns), tuple_(*cursor_value)
+            else:
+                keys, values = order_columns[0], cursor_value
             if reverse:
-                query = query.filter(cursor_column < cursor_value)
+                query = query.filter(keys < values)
             else:
-                query = query.filter(cursor_column > cursor_value)
+                query = query.filter(keys > values)
 
         # Apply ordering
-        cursor_column = getattr(query.column_descriptions[0]['entity'], cursor_field)
         if reverse:
-            query = query.order_by(cursor_column.desc())
+            query = query.order_by(*(column.desc() for column in order_columns))
         else:
-            query = query.order_by(cursor_column.asc())
+            query = query.order_by(*(column.asc() for column in order_columns))
 
         # Get one extra item to determine if there are more pages
         items = query.limit(limit + 1).all()
@@ -132,7 +320,8 @@ class AdvancedPagination:
         cursor_info = {}
         if items:
             last_item = items[-1]
-            cursor_info['next_cursor'] = getattr(last_item, cursor_field)
+            cursor = tuple(getattr(last_item, column.key) for column in order_columns)
+            cursor_info['next_cursor'] = cursor if len(cursor) > 1 else cursor[0]
             cursor_info['has_next'] = has_next
         else:
             cursor_info['next_cursor'] = None
@@ -150,6 +339,7 @@ class PaginationBuilder:
 
     def __init__(self, query: Query):
         self.query = query
+        self._columns = _entity_columns(query.column_descriptions[0]['entity'])
         self._filters = []
         self._sorts = []
         self._paginated = False
@@ -160,7 +350,7 @@ class PaginationBuilder:
         """Add filters to the query."""
         for field, value in filters.items():
             if value is not None:
-                column = getattr(self.query.column_descriptions[0]['entity'], field)
+                column = self._columns[field]
                 if isinstance(value, (list, tuple)):
                     self._filters.append(column.in_(value))
                 elif isinstance(value, str) and '%' in value:
@@ -172,7 +362,7 @@ class PaginationBuilder:
     def filter_range(self, field: str, min_value: Optional[Any] = None, max_value: Optional[Any] = None) -> 'PaginationBuilder':
         """Add range filter to the query."""
         if min_value is not None or max_value is not None:
-            column = getattr(self.query.column_descriptions[0]['entity'], field)
+            column = self._columns[field]
             if min_value is not None:
                 self._filters.append(column >= min_value)
             if max_value is not None:
@@ -184,7 +374,7 @@ class PaginationBuilder:
         if search_term:
             conditions = []
             for field in fields:
-                column = getattr(self.query.column_descriptions[0]['entity'], field)
+                column = self._columns[field]
                 conditions.append(column.ilike(f"%{search_term}%"))
             if conditions:
                 from sqlalchemy import or_
@@ -193,7 +383,7 @@ class PaginationBuilder:
 
     def sort_by(self, field: str, ascending: bool = True) -> 'PaginationBuilder':
         """Add sort to the query."""
-        column = getattr(self.query.column_descriptions[0]['entity'], field)
+        column = self._columns[field]
         if ascending:
             self._sorts.append(column.asc())
         else:
@@ -209,9 +399,9 @@ class PaginationBuilder:
 
     def execute(self) -> Tuple[List[Any], PaginationInfo]:
         """Execute the built query with pagination."""
-        # Apply filters
-        for filter_condition in self._filters:
-            self.query = self.query.filter(filter_condition)
+        # Apply filters in one call rather than cloning the query per condition
+        if self._filters:
+            self.query = self.query.filter(*self._filters)
 
         # Apply sorts
         if self._sorts:
@@ -238,51 +428,89 @@ class PaginationBuilder:
             return items, pagination_info
 
 
+def _params_digest(params: Dict[str, Any]) -> str:
+    """
+    Digest parameters into a stable cache key.
+    
+    Canonical JSON hashed with BLAKE2b is the same in every process (unlike
+    the seeded built-in hash()), does not silently collide, and accepts
+    unhashable values such as list filters.
+    """
+    canonical = json.dumps(params, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
 class PageCache:
-    """Simple in-memory cache for pagination results."""
+    """Simple in-memory LRU cache for pagination results."""
     
     def __init__(self, max_size: int = 100):
-        self.cache: Dict[str, PaginatedResult] = {}
+        self.cache: "OrderedDict[str, PaginatedResult]" = OrderedDict()
         self.max_size = max_size
-        self.access_order: List[str] = []
 
     def _make_key(self, query_params: Dict[str, Any]) -> str:
         """Create a cache key from query parameters."""
-        sorted_params = sorted(query_params.items())
-        return str(hash(tuple(sorted_params)))
+        return _params_digest(query_params)
 
     def get(self, query_params: Dict[str, Any]) -> Optional[PaginatedResult]:
         """Get cached pagination result."""
         key = self._make_key(query_params)
         
-        if key in self.cache:
+        try:
             # Move to end of access order (most recently used)
-            self.access_order.remove(key)
-            self.access_order.append(key)
-            return self.cache[key]
-        
-        return None
+            self.cache.move_to_end(key)
+        except KeyError:
+            return None
+        return self.cache[key]
 
     def set(self, query_params: Dict[str, Any], result: PaginatedResult) -> None:
         """Cache pagination result."""
         key = self._make_key(query_params)
         
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        self.cache[key] = result
+        
         # Remove oldest if cache is full
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+
+    def clear(self) -> None:
+        """Clear the cache."""
+        self.cache.clear()
+
+
+class CountCache:
+    """TTL- and size-bounded cache of query row counts, keyed by filter signature."""
+    
+    def __init__(self, max_size: int = 1000, ttl_seconds: int = 60):
+        self.cache: Dict[str, Tuple[float, int]] = {}
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[int]:
+        """Get a cached count, if present and not expired."""
+        entry = self.cache.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key: str, total: int) -> None:
+        """Cache a count."""
         if len(self.cache) >= self.max_size:
-            oldest_key = self.access_order.pop(0)
-            del self.cache[oldest_key]
-        
-        self.cache[key] = result
-        self.access_order.append(key)
+            self.cache.clear()
+        self.cache[key] = (time.monotonic() + self.ttl_seconds, total)
 
     def clear(self) -> None:
         """Clear the cache."""
         self.cache.clear()
-        self.access_order.clear()
 
 
-# Global cache instance
+# Global cache instances
 pagination_cache = PageCache(max_size=200)
+count_cache = CountCache()
+
+# Counts this small are cheap enough to recompute rather than cache
+COUNT_CACHE_MIN_TOTAL = 1000
 
 
 def get_paginated_result(
@@ -290,7 +518,9 @@ def get_paginated_result(
     page: int = 1,
     per_page: int = 20,
     max_per_page: int = 100,
-    cache_key: Optional[Dict[str, Any]] = None
+    cache_key: Optional[Dict[str, Any]] = None,
+    count: Optional[bool] = None,
+    eager: Optional[Sequence[Any]] = None
 ) -> Tuple[List[Any], PaginationInfo]:
     """
     Get paginated results with optional caching.
@@ -301,11 +531,24 @@ def get_paginated_result(
         per_page: Items per page
         max_per_page: Maximum allowed items per page
         cache_key: Parameters to use for cache key
+        count: Whether to count rows; defaults to the inverse of the app's
+            OPTIMIZE_PAGINATION_FOR_SPEED setting
+        eager: Relationship attributes to batch-load for the page's rows
         
     Returns:
         Tuple of (items, pagination_info)
     """
+    if count is None:
+        count = not (has_app_context() and current_app.config.get("OPTIMIZE_PAGINATION_FOR_SPEED"))
+    
+    total = None
     if cache_key is not None:
+        # The count is the same for every page of a filter set, so it is cached apart
+        filter_key = _params_digest(
+            {k: v for k, v in cache_key.items() if k not in ('page', 'per_page')}
+        )
+        total = count_cache.get(filter_key)
+        
         cache_key['page'] = page
         cache_key['per_page'] = per_page
         cached_result = pagination_cache.get(cache_key)
@@ -313,8 +556,16 @@ def get_paginated_result(
             return cached_result.items, cached_result.pagination
 
     items, pagination_info = AdvancedPagination.offset_based_paginate(
-        query, page, per_page, max_per_page
+        query, page, per_page, max_per_page, total=total, count=count, eager=eager
     )
+    
+    if (
+        cache_key is not None
+        and total is None
+        and pagination_info.total is not None
+        and pagination_info.total >= COUNT_CACHE_MIN_TOTAL
+    ):
+        count_cache.set(filter_key, pagination_info.total)
 
     # Cache the result
     if cache_key is not None:
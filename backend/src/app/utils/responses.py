@@ -1,9 +1,46 @@
 """Standardized response utilities for the GuitarTab Pro API."""
 
-from typing import Any, Dict, List, Optional, Union
-from flask import jsonify, Response
+import hashlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
-from ..schemas.song import SongResponseSchema, SongListResponseSchema
+import orjson
+from flask import Response, has_request_context, request
+
+from ..schemas.song import (
+    SONG_LIST_FIELDS,
+    SongListResponseSchema,
+    SongResponseSchema,
+    get_adapter,
+)
+
+
+def _json_response(data: Any) -> Response:
+    """
+    Encode a response body with orjson instead of the stdlib-backed jsonify.
+
+    orjson encodes UUID, datetime and dataclass values natively; anything else
+    falls back to str().
+    """
+    return Response(
+        orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS),
+        mimetype="application/json"
+    )
+
+
+def set_body_etag(response: Response) -> Response:
+    """
+    Tag a response with a weak ETag derived from its body.
+
+    Hashing the encoded body covers every field in the representation, so the
+    tag changes whenever anything the client would see changes.
+    """
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest(), weak=True)
+    return response
+
+
+def version_etag(*parts: Any) -> str:
+    """Build an ETag value from whatever identifies a response's version (counts, params...)."""
+    return hashlib.blake2b(orjson.dumps(parts, default=str), digest_size=16).hexdigest()
 
 
 class APIResponse:
@@ -25,7 +62,7 @@ class APIResponse:
         if meta is not None:
             response_data["meta"] = meta
         
-        return jsonify(response_data), status_code
+        return _json_response(response_data), status_code
     
     @staticmethod
     def created(
@@ -43,7 +80,7 @@ class APIResponse:
         if location is not None:
             headers["Location"] = location
         
-        return jsonify(response_data), 201, headers
+        return _json_response(response_data), 201, headers
     
     @staticmethod
     def no_content() -> tuple[Response, int]:
@@ -52,29 +89,64 @@ class APIResponse:
     
     @staticmethod
     def paginated(
-        items: List[Any],
+        items: Iterable[Any],
         total: int,
         page: int,
         per_page: int,
-        message: str = "Success"
+        message: str = "Success",
+        serialize: Optional[Callable[[Any], Any]] = None,
+        etag: Optional[str] = None
     ) -> tuple[Response, int]:
-        """Create a paginated response."""
+        """
+        Create a paginated response.
+
+        With ``serialize``, items are converted and encoded one at a time, so
+        only one item's dict is alive at once rather than a list of them all.
+        The response carries a weak ETag (``etag`` if given, else a hash of the
+        body), and a matching If-None-Match turns it into a bodyless 304.
+        """
         total_pages = (total + per_page - 1) // per_page
         
-        response_data = {
-            "message": message,
-            "items": items,
-            "meta": {
-                "total": total,
-                "page": page,
-                "per_page": per_page,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
-            }
+        meta = {
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "total_pages": total_pages,
+            "has_next": page < total_pages,
+            "has_prev": page > 1
         }
         
-        return jsonify(response_data), 200
+        if serialize is None:
+            response = _json_response({"message": message, "items": items, "meta": meta})
+        else:
+            encoded_items = b",".join(
+                orjson.dumps(serialize(item), default=str, option=orjson.OPT_NON_STR_KEYS)
+                for item in items
+            )
+            response = Response(
+                b'{"message":' + orjson.dumps(message)
+                + b',"items":[' + encoded_items
+                + b'],"meta":' + orjson.dumps(meta) + b"}",
+                mimetype="application/json"
+            )
+        
+        # Clients revalidate with If-None-Match and get an empty 304 when the page is unchanged
+        if etag is None:
+            set_body_etag(response)
+        else:
+            response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "private, no-cache"
+        if has_request_context():
+            response.make_conditional(request)
+        return response, response.status_code
+    
+    @staticmethod
+    def not_modified(etag: str) -> Response:
+        """Create a bodyless 304 for a paginated response whose weak ETag still matches."""
+        response = Response(status=304, mimetype="application/json")
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
     
     @staticmethod
     def bad_request(message: str, errors: Optional[Dict[str, Any]] = None) -> tuple[Response, int]:
@@ -84,27 +156,27 @@ class APIResponse:
         if errors is not None:
             response_data["errors"] = errors
         
-        return jsonify(response_data), 400
+        return _json_response(response_data), 400
     
     @staticmethod
     def unauthorized(message: str = "Authentication required") -> tuple[Response, int]:
         """Create a 401 Unauthorized response."""
-        return jsonify({"message": message}), 401
+        return _json_response({"message": message}), 401
     
     @staticmethod
     def forbidden(message: str = "Permission denied") -> tuple[Response, int]:
         """Create a 403 Forbidden response."""
-        return jsonify({"message": message}), 403
+        return _json_response({"message": message}), 403
     
     @staticmethod
     def not_found(message: str = "Resource not found") -> tuple[Response, int]:
         """Create a 404 Not Found response."""
-        return jsonify({"message": message}), 404
+        return _json_response({"message": message}), 404
     
     @staticmethod
     def conflict(message: str = "Resource conflict") -> tuple[Response, int]:
         """Create a 409 Conflict response."""
-        return jsonify({"message": message}), 409
+        return _json_response({"message": message}), 409
     
     @staticmethod
     def unprocessable_entity(message: str, errors: Optional[Dict[str, Any]] = None) -> tuple[Response, int]:
@@ -114,17 +186,17 @@ class APIResponse:
         if errors is not None:
             response_data["errors"] = errors
         
-        return jsonify(response_data), 422
+        return _json_response(response_data), 422
     
     @staticmethod
     def too_many_requests(message: str = "Rate limit exceeded") -> tuple[Response, int]:
         """Create a 429 Too Many Requests response."""
-        return jsonify({"message": message}), 429
+        return _json_response({"message": message}), 429
     
     @staticmethod
     def internal_server_error(message: str = "Internal server error") -> tuple[Response, int]:
         """Create a 500 Internal Server Error response."""
-        return jsonify({"message": message}), 500
+        return _json_response({"message": message}), 500
 
 
 class SchemaResponse:
@@ -133,34 +205,44 @@ class SchemaResponse:
     @staticmethod
     def song_response(song: Any) -> tuple[Response, int]:
         """Create a single song response."""
-        schema_data = SongResponseSchema.model_validate(song).model_dump()
+        schema_data = SongResponseSchema.from_song(song).model_dump()
         return APIResponse.success("Song retrieved successfully", data=schema_data)
     
+    @staticmethod
+    def songs_data(songs: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Dump full song responses for many rows in one pydantic-core call."""
+        return get_adapter(List[SongResponseSchema]).dump_python(
+            [SongResponseSchema.from_song(song) for song in songs]
+        )
+    
+    @staticmethod
+    def song_list_item(song: Any) -> Dict[str, Any]:
+        """Read a song's list-response fields straight off the row, bypassing pydantic."""
+        return {name: getattr(song, name) for name in SONG_LIST_FIELDS}
+    
     @staticmethod
     def songs_list_response(
         songs: List[Any],
         total: int,
         page: int,
-        per_page: int
+        per_page: int,
+        etag: Optional[str] = None
     ) -> tuple[Response, int]:
         """Create a paginated songs list response."""
-        schema_data = [
-            SongResponseSchema.model_validate(song).model_dump() 
-            for song in songs
-        ]
-        
         return APIResponse.paginated(
-            items=schema_data,
+            items=songs,
             total=total,
             page=page,
             per_page=per_page,
-            message="Songs retrieved successfully"
+            message="Songs retrieved successfully",
+            serialize=SchemaResponse.song_list_item,
+            etag=etag
         )
     
     @staticmethod
     def song_created(song: Any, location: Optional[str] = None) -> tuple[Response, int, dict]:
         """Create a song created response."""
-        schema_data = SongResponseSchema.model_validate(song).model_dump()
+        schema_data = SongResponseSchema.from_song(song).model_dump()
         headers = {}
         
         if location:
@@ -177,7 +259,7 @@ class SchemaResponse:
     @staticmethod
     def song_updated(song: Any) -> tuple[Response, int]:
         """Create a song updated response."""
-        schema_data = SongResponseSchema.model_validate(song).model_dump()
+        schema_data = SongResponseSchema.from_song(song).model_dump()
         return APIResponse.success("Song updated successfully", data=schema_data)
     
     @staticmethod
@@ -193,7 +275,7 @@ class ErrorResponse:
     def from_exception(exception: Exception) -> tuple[Response, int]:
         """Create an error response from an exception."""
         if hasattr(exception, 'status_code') and hasattr(exception, 'detail'):
-            return jsonify({
+            return _json_response({
                 "message": exception.detail,
                 "code": getattr(exception, 'code', 'unknown'),
                 "errors": getattr(exception, 'errors', None)
@@ -209,4 +291,4 @@ class ErrorResponse:
     @staticmethod
     def service_error(message: str, status_code: int = 500) -> tuple[Response, int]:
         """Create a service error response."""
-        return jsonify({"message": message}), status_code
+        return _json_response({"message": message}), status_code
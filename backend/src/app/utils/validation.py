@@ -1,12 +1,94 @@
 """Centralized validation utilities for the GuitarTab Pro API."""
 
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import AbstractSet, Any, Callable, Dict, List, Optional, Pattern, Union
 from uuid import UUID
 import re
-from urllib.parse import urlparse
+import string
+
+from pydantic import ValidationError as PydanticValidationError
 
 from ..utils.exceptions import ValidationError
 
+# Compiled once at import rather than looked up in re's internal cache per call
+_PW_UPPER = re.compile(r'[A-Z]')
+_PW_LOWER = re.compile(r'[a-z]')
+_PW_DIGIT = re.compile(r'\d')
+_PW_SPECIAL = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+_SORT_SCRUB = re.compile(r'[^a-zA-Z0-9_-]')
+
+_SORT_ORDERS = frozenset(('asc', 'desc'))
+_DEFAULT_SORT_ORDER = 'asc'
+
+# Deletes every ASCII character _SORT_SCRUB would strip, without a regex pass
+_SORT_KEEP = frozenset(string.ascii_letters + string.digits + '_-')
+_SORT_TRANS = str.maketrans('', '', ''.join(chr(i) for i in range(128) if chr(i) not in _SORT_KEEP))
+
+# Allowed byte sets for the table-driven email check: local@domain.tld
+_EMAIL_LOCAL_CHARS = (string.ascii_letters + string.digits + '._%+-').encode('ascii')
+_EMAIL_DOMAIN_CHARS = (string.ascii_letters + string.digits + '.-').encode('ascii')
+_EMAIL_TLD_CHARS = string.ascii_letters.encode('ascii')
+
+# Byte -> bitmask of the password character classes it belongs to (ASCII only)
+_PW_SPECIAL_CHARS = '!@#$%^&*(),.?":{}|<>'
+_PW_ALL_CLASSES = 0b1111
+
+
+def _build_password_class_table() -> bytes:
+    """Build the 256-entry table mapping each byte to its character-class bits."""
+    table = bytearray(256)
+    for bit, chars in (
+        (0b0001, string.ascii_uppercase),
+        (0b0010, string.ascii_lowercase),
+        (0b0100, string.digits),
+        (0b1000, _PW_SPECIAL_CHARS),
+    ):
+        for char in chars:
+            table[ord(char)] |= bit
+    return bytes(table)
+
+
+_PW_CLASS_TABLE = _build_password_class_table()
+
+
+def _is_valid_email(email: str) -> bool:
+    """
+    Check an already-stripped email against ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$.
+
+    Each part is scanned once with bytes.translate (deleting the allowed bytes
+    leaves nothing behind for a valid part), so there is no backtracking.
+    """
+    if not email.isascii():
+        return False
+    
+    data = email.encode('ascii')
+    at = data.find(b'@')
+    if at < 1:
+        return False
+    
+    domain = data[at + 1:]
+    dot = domain.rfind(b'.')
+    if dot < 1 or len(domain) - dot - 1 < 2:
+        return False
+    
+    return not (
+        data[:at].translate(None, _EMAIL_LOCAL_CHARS)
+        or domain.translate(None, _EMAIL_DOMAIN_CHARS)
+        or domain[dot + 1:].translate(None, _EMAIL_TLD_CHARS)
+    )
+
+
+@lru_cache(maxsize=512)
+def _compile_pattern(pattern: str) -> Pattern[str]:
+    """Compile a caller-supplied constraint pattern, reusing earlier compilations."""
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=128)
+def _allowed_keys(required: tuple, optional: tuple) -> frozenset:
+    """Union of required and optional keys, built once per distinct field spec."""
+    return frozenset(required) | frozenset(optional)
+
 
 class FieldValidator:
     """Utility class for validating common field types."""
@@ -18,25 +100,40 @@ class FieldValidator:
             return value
         
         if isinstance(value, str):
+            # Canonical hyphenated form: parse the hex digits directly
+            if (
+                len(value) == 36
+                and value[8] == '-' and value[13] == '-'
+                and value[18] == '-' and value[23] == '-'
+            ):
+                digits = value.replace('-', '')
+                # isalnum/isascii keep int() from accepting signs, underscores or spaces
+                if len(digits) == 32 and digits.isascii() and digits.isalnum():
+                    try:
+                        return UUID(int=int(digits, 16))
+                    except ValueError:
+                        raise ValidationError(reason="invalid_uuid", field=field_name)
+            
             try:
                 return UUID(value)
             except ValueError:
-                raise ValidationError(f"Invalid {field_name} format: must be a valid UUID")
+                raise ValidationError(reason="invalid_uuid", field=field_name)
         
-        raise ValidationError(f"Invalid {field_name} format: expected string or UUID")
+        raise ValidationError(reason="expected_uuid", field=field_name)
     
     @staticmethod
     def validate_email(email: str, field_name: str = "email") -> str:
         """Validate email format."""
         if not email or not isinstance(email, str):
-            raise ValidationError(f"{field_name} is required")
+            raise ValidationError(reason="required", field=field_name)
         
-        # Basic email regex pattern
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email.strip()):
-            raise ValidationError(f"Invalid {field_name} format")
+        email = email.strip()
         
-        return email.strip().lower()
+        # Basic email format check
+        if not _is_valid_email(email):
+            raise ValidationError(reason="invalid_format", field=field_name)
+        
+        return email.lower()
     
     @staticmethod
     def validate_password_strength(password: str, min_length: int = 8) -> str:
@@ -48,12 +145,25 @@ class FieldValidator:
             raise ValidationError(f"Password must be at least {min_length} characters long")
         
         # Check for at least one uppercase, lowercase, digit, and special character
-        has_upper = bool(re.search(r'[A-Z]', password))
-        has_lower = bool(re.search(r'[a-z]', password))
-        has_digit = bool(re.search(r'\d', password))
-        has_special = bool(re.search(r'[!@#$%^&*(),.?":{}|<>]', password))
+        if password.isascii():
+            # One pass over the bytes, stopping as soon as every class has been seen
+            classes = 0
+            for byte in password.encode('ascii'):
+                classes |= _PW_CLASS_TABLE[byte]
+                if classes == _PW_ALL_CLASSES:
+                    break
+            has_all_classes = classes == _PW_ALL_CLASSES
+        else:
+            # Non-ASCII input keeps the regex semantics (e.g. Unicode digits match \d);
+            # the class weak passwords most often lack is checked first
+            has_all_classes = bool(
+                _PW_SPECIAL.search(password)
+                and _PW_DIGIT.search(password)
+                and _PW_UPPER.search(password)
+                and _PW_LOWER.search(password)
+            )
         
-        if not (has_upper and has_lower and has_digit and has_special):
+        if not has_all_classes:
             raise ValidationError(
                 "Password must contain at least one uppercase letter, "
                 "one lowercase letter, one digit, and one special character"
@@ -67,20 +177,36 @@ class FieldValidator:
         if not url:
             if allow_empty:
                 return None
-            raise ValidationError(f"{field_name} is required")
+            raise ValidationError(reason="required", field=field_name)
         
         if not isinstance(url, str):
-            raise ValidationError(f"Invalid {field_name} format: expected string")
+            raise ValidationError(reason="expected_string", field=field_name)
+        
+        url = url.strip()
         
-        # Validate URL format
-        parsed = urlparse(url.strip())
-        if not parsed.scheme or not parsed.netloc:
-            raise ValidationError(f"Invalid {field_name} format: must include protocol (http/https)")
+        # Only the scheme and the presence of a host matter, so skip full URI parsing
+        prefix = url[:8].lower()
+        if prefix.startswith('https://'):
+            rest = url[8:]
+        elif prefix.startswith('http://'):
+            rest = url[7:]
+        elif '://' in url:
+            raise ValidationError(reason="unsupported_protocol", field=field_name)
+        else:
+            raise ValidationError(reason="missing_protocol", field=field_name)
         
-        if parsed.scheme not in ['http', 'https']:
-            raise ValidationError(f"Invalid {field_name} format: only HTTP and HTTPS protocols are allowed")
+        # The host runs up to the first path, query or fragment delimiter
+        end = len(rest)
+        for delimiter in '/?#':
+            index = rest.find(delimiter, 0, end)
+            if index >= 0:
+                end = index
+        netloc = rest[:end]
+        # Like urlparse, any non-empty host is accepted, including IDN hosts
+        if not netloc:
+            raise ValidationError(reason="missing_protocol", field=field_name)
         
-        return url.strip()
+        return url
     
     @staticmethod
     def validate_pagination_params(
@@ -90,18 +216,18 @@ class FieldValidator:
     ) -> tuple[int, int]:
         """Validate and normalize pagination parameters."""
         try:
-            page = int(page) if isinstance(page, str) else page
-            per_page = int(per_page) if isinstance(per_page, str) else per_page
+            # int() accepts both query-string and already-numeric values
+            page = int(page)
+            per_page = int(per_page)
         except (ValueError, TypeError):
             raise ValidationError("Invalid pagination parameters: page and per_page must be integers")
         
-        if page < 1:
-            raise ValidationError("Invalid page parameter: must be >= 1")
-        
-        if per_page < 1:
-            raise ValidationError("Invalid per_page parameter: must be >= 1")
-        
-        if per_page > max_per_page:
+        # Single check on the common path; work out which bound failed only on a miss
+        if not (page >= 1 and 1 <= per_page <= max_per_page):
+            if page < 1:
+                raise ValidationError("Invalid page parameter: must be >= 1")
+            if per_page < 1:
+                raise ValidationError("Invalid per_page parameter: must be >= 1")
             raise ValidationError(f"Invalid per_page parameter: maximum allowed is {max_per_page}")
         
         return page, per_page
@@ -110,25 +236,35 @@ class FieldValidator:
     def validate_sort_parameters(
         sort_by: str,
         sort_order: Optional[str] = None,
-        allowed_fields: Optional[List[str]] = None
+        allowed_fields: Optional[AbstractSet[str]] = None
     ) -> tuple[str, str]:
-        """Validate sorting parameters."""
+        """
+        Validate sorting parameters.
+
+        ``allowed_fields`` should be a set (ideally a module-level frozenset)
+        so the membership check is a single hash lookup.
+        """
         if not sort_by or not isinstance(sort_by, str):
             raise ValidationError("sort_by parameter is required")
         
-        # Remove any potentially dangerous characters
-        sort_by = re.sub(r'[^a-zA-Z0-9_-]', '', sort_by)
+        # Remove any potentially dangerous characters; plain identifiers are already clean
+        if sort_by.isascii():
+            if not sort_by.isidentifier():
+                sort_by = sort_by.translate(_SORT_TRANS)
+        else:
+            sort_by = _SORT_SCRUB.sub('', sort_by)
         
         if allowed_fields and sort_by not in allowed_fields:
-            raise ValidationError(f"Invalid sort field '{sort_by}'. Allowed fields: {', '.join(allowed_fields)}")
+            allowed = ', '.join(sorted(allowed_fields))
+            raise ValidationError(f"Invalid sort field '{sort_by}'. Allowed fields: {allowed}")
         
         # Normalize sort order
         if sort_order:
             sort_order = sort_order.lower().strip()
-            if sort_order not in ['asc', 'desc']:
+            if sort_order not in _SORT_ORDERS:
                 raise ValidationError("Invalid sort_order parameter: must be 'asc' or 'desc'")
         else:
-            sort_order = 'sort_order'
+            sort_order = _DEFAULT_SORT_ORDER
         
         return sort_by, sort_order
 
@@ -143,23 +279,22 @@ class RequestValidator:
         optional: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """Validate query parameters."""
-        errors = {}
+        errors = []
         
         # Check required parameters
         if required:
             for param in required:
-                if param not in params or params[param] is None:
-                    errors[param] = f"{param} parameter is required"
+                if params.get(param) is None:
+                    errors.append((param, f"{param} parameter is required"))
         
         # Check for unexpected parameters
         if optional:
-            allowed_params = set(required or []) | set(optional)
-            for param in params:
-                if param not in allowed_params:
-                    errors[param] = f"Unexpected parameter: {param}"
+            for param in params.keys() - _allowed_keys(tuple(required or ()), tuple(optional)):
+                errors.append((param, f"Unexpected parameter: {param}"))
         
         if errors:
-            raise ValidationError("Invalid query parameters", errors=errors)
+            # Collected as pairs and turned into a dict once, on the failure path only
+            raise ValidationError("Invalid query parameters", errors=dict(errors))
         
         return params
     
@@ -170,23 +305,22 @@ class RequestValidator:
         optional_fields: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """Validate request body data."""
-        errors = {}
+        errors = []
         
         # Check required fields
         if required_fields:
             for field in required_fields:
-                if field not in data or data[field] is None:
-                    errors[field] = f"{field} field is required"
+                if data.get(field) is None:
+                    errors.append((field, f"{field} field is required"))
         
         # Check for unexpected fields
         if optional_fields:
-            allowed_fields = set(required_fields or []) | set(optional_fields)
-            for field in data:
-                if field not in allowed_fields:
-                    errors[field] = f"Unexpected field: {field}"
+            allowed_fields = _allowed_keys(tuple(required_fields or ()), tuple(optional_fields))
+            for field in data.keys() - allowed_fields:
+                errors.append((field, f"Unexpected field: {field}"))
         
         if errors:
-            raise ValidationError("Invalid request body", errors=errors)
+            raise ValidationError("Invalid request body", errors=dict(errors))
         
         return data
 
@@ -201,22 +335,39 @@ class SchemaValidator:
         context: Optional[str] = None
     ) -> Any:
         """Validate data against a Pydantic model."""
+        error_context = f" ({context})" if context else ""
         try:
+            if hasattr(model_class, 'model_validate'):
+                return model_class.model_validate(data)
             return model_class(**data)
+        except PydanticValidationError as e:
+            # errors() is a plain list of dicts; str(e) would format the whole error tree
+            raise ValidationError(
+                detail=f"Invalid data format{error_context}",
+                errors=e.errors()
+            )
         except Exception as e:
-            error_context = f" ({context})" if context else ""
             raise ValidationError(
                 detail=f"Invalid data format{error_context}",
                 errors=str(e)
             )
     
+    @staticmethod
+    def validate_model_data_dict(
+        data: Dict[str, Any],
+        model_class: Any,
+        context: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Validate data against a Pydantic model and return the validated fields as a dict."""
+        return SchemaValidator.validate_model_data(data, model_class, context).model_dump()
+    
     @staticmethod
     def validate_field_constraints(
         data: Dict[str, Any],
         constraints: Dict[str, Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Validate field constraints."""
-        errors = {}
+        errors = []
         
         for field, constraint in constraints.items():
             if field not in data:
@@ -224,30 +375,102 @@ class SchemaValidator:
             
             value = data[field]
             
-            # Length constraints
-            if 'min_length' in constraint:
-                if isinstance(value, str) and len(value) < constraint['min_length']:
-                    errors[field] = f"Minimum length: {constraint['min_length']}"
+            # Type is checked once; only the constraints for that type run
+            if isinstance(value, str):
+                # Length constraints
+                if 'min_length' in constraint and len(value) < constraint['min_length']:
+                    errors.append((field, f"Minimum length: {constraint['min_length']}"))
+                
+                if 'max_length' in constraint and len(value) > constraint['max_length']:
+                    errors.append((field, f"Maximum length: {constraint['max_length']}"))
+                
+                # Pattern constraints
+                if 'pattern' in constraint:
+                    # Schemas may precompile their pattern once under '_compiled'
+                    compiled = constraint.get('_compiled')
+                    if compiled is None:
+                        compiled = _compile_pattern(constraint['pattern'])
+                    if not compiled.match(value):
+                        errors.append(
+                            (field, f"Invalid format: must match pattern {constraint['pattern']}")
+                        )
             
+            elif isinstance(value, (int, float)):
+                # Range constraints
+                if 'min_value' in constraint and value < constraint['min_value']:
+                    errors.append((field, f"Minimum value: {constraint['min_value']}"))
+                
+                if 'max_value' in constraint and value > constraint['max_value']:
+                    errors.append((field, f"Maximum value: {constraint['max_value']}"))
+        
+        if errors:
+            raise ValidationError("Field validation failed", errors=dict(errors))
+        
+        return data
+    
+    @staticmethod
+    def compile_constraints(
+        constraints: Dict[str, Dict[str, Any]]
+    ) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Generate a validator specialized for one constraints dict.
+
+        The returned function is straight-line code containing only the checks
+        each field declares, with limits, messages and bound pattern matchers
+        passed in as names, so no constraint dict is consulted per record.
+        It raises the same errors as ``validate_field_constraints``. Compile at
+        schema load and reuse it for every record (bulk imports, lists).
+        """
+        namespace: Dict[str, Any] = {"ValidationError": ValidationError}
+        
+        def bind(value: Any) -> str:
+            name = f"_c{len(namespace)}"
+            namespace[name] = value
+            return name
+        
+        lines = ["def validate(data):", "    errors = {}"]
+        for field, constraint in constraints.items():
+            # (condition source, message) pairs; conditions test the local ``value``
+            text = []
+            number = []
+            if 'min_length' in constraint:
+                limit = constraint['min_length']
+                text.append((f"len(value) < {bind(limit)}", f"Minimum length: {limit}"))
             if 'max_length' in constraint:
-                if isinstance(value, str) and len(value) > constraint['max_length']:
-                    errors[field] = f"Maximum length: {constraint['max_length']}"
-            
-            # Range constraints
+                limit = constraint['max_length']
+                text.append((f"len(value) > {bind(limit)}", f"Maximum length: {limit}"))
             if 'min_value' in constraint:
-                if isinstance(value, (int, float)) and value < constraint['min_value']:
-                    errors[field] = f"Minimum value: {constraint['min_value']}"
-            
+                limit = constraint['min_value']
+                number.append((f"value < {bind(limit)}", f"Minimum value: {limit}"))
             if 'max_value' in constraint:
-                if isinstance(value, (int, float)) and value > constraint['max_value']:
-                    errors[field] = f"Maximum value: {constraint['max_value']}"
-            
-            # Pattern constraints
+                limit = constraint['max_value']
+                number.append((f"value > {bind(limit)}", f"Maximum value: {limit}"))
             if 'pattern' in constraint:
-                if isinstance(value, str) and not re.match(constraint['pattern'], value):
-                    errors[field] = f"Invalid format: must match pattern {constraint['pattern']}"
-        
-        if errors:
-            raise ValidationError("Field validation failed", errors=errors)
+                pattern = constraint.get('_compiled') or _compile_pattern(constraint['pattern'])
+                text.append((
+                    f"not {bind(pattern.match)}(value)",
+                    f"Invalid format: must match pattern {constraint['pattern']}",
+                ))
+            if not (text or number):
+                continue
+            
+            key = bind(field)
+            lines += [f"    if {key} in data:", f"        value = data[{key}]"]
+            branch = "if"
+            for kind, checks in (("str", text), ("(int, float)", number)):
+                if not checks:
+                    continue
+                lines.append(f"        {branch} isinstance(value, {kind}):")
+                # Later failures overwrite earlier ones, as in validate_field_constraints
+                for condition, message in checks:
+                    lines.append(f"            if {condition}:")
+                    lines.append(f"                errors[{key}] = {bind(message)}")
+                branch = "elif"
+        lines += [
+            "    if errors:",
+            "        raise ValidationError('Field validation failed', errors=errors)",
+            "    return data",
+        ]
         
-        return data
+        exec(compile("\n".join(lines), "<compiled constraints>", "exec"), namespace)
+        return namespace["validate"]
@@ -72,6 +72,9 @@ def test_error_handlers():
 
 
 if __name__ == "__main__":
+    # Buffer output and write it out in blocks rather than flushing on every line
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    
     print("🧪 Testing GuitarTab Pro Flask API Setup")
     print("=" * 50)
     
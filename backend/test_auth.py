@@ -22,6 +22,11 @@ def test_password_hashing():
     print(f"Hashed password: {hashed}")
     print(f"Verification: {PasswordManager.verify_password(password, hashed)}")
     print(f"Wrong password verification: {PasswordManager.verify_password('wrong', hashed)}")
+
+    passwords = ["FirstPassword1!", "SecondPassword2@", "ThirdPassword3#"]
+    hashes = PasswordManager.hash_passwords_batch(passwords)
+    results = PasswordManager.verify_passwords_batch(zip(passwords, hashes))
+    print(f"Batch verification: {results}")
     print()
 
 
@@ -62,6 +67,9 @@ def test_app_creation():
 
 
 if __name__ == "__main__":
+    # Buffer output and write it out in blocks rather than flushing on every line
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
     print("🧪 Testing GuitarTab Pro Authentication System")
     print("=" * 50)
 